@@ -1,9 +1,11 @@
 from django.views.generic.base import TemplateView
 
+from core.prerender import PrerenderedMixin
 
-class AboutAuthorView(TemplateView):
+
+class AboutAuthorView(PrerenderedMixin, TemplateView):
     template_name = 'about/author.html'
 
 
-class AboutTechView(TemplateView):
+class AboutTechView(PrerenderedMixin, TemplateView):
     template_name = 'about/tech.html'
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_CACHE_KEY = 'auth:user:{}'
+
+
+def user_cache_key(user_id):
+    return USER_CACHE_KEY.format(user_id)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берёт пользователя сессии из общего кеша."""
+
+    def get_user(self, user_id):
+        if not settings.SHARED_CACHE:
+            return super().get_user(user_id)
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
+
+
+def invalidate_user(sender, instance, **kwargs):
+    cache.delete(user_cache_key(instance.pk))
+
+
+def connect_signals():
+    from django.db.models.signals import post_delete, post_save
+
+    User = get_user_model()
+    post_save.connect(invalidate_user, sender=User)
+    post_delete.connect(invalidate_user, sender=User)
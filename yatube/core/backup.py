@@ -0,0 +1,147 @@
+import gzip
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+COMPRESSED_SUFFIX = '.gz'
+
+
+class BackupStats:
+    def __init__(self):
+        self.pages = 0
+        self.page_size = 0
+        self.seconds = 0.0
+
+    @property
+    def bytes(self):
+        return self.pages * self.page_size
+
+    @property
+    def throughput(self):
+        """Мегабайты в секунду."""
+        return self.bytes / 1024 / 1024 / self.seconds if self.seconds else 0
+
+
+def copy_pages(source, target, progress=None):
+    """
+    Копирует базу онлайн-API бэкапа SQLite по BACKUP_PAGES страниц.
+
+    Между шагами блокировка отпускается на BACKUP_SLEEP секунд, так что
+    запись в базу не останавливается на всё время копирования.
+    """
+    stats = BackupStats()
+    stats.page_size = source.execute('PRAGMA page_size').fetchone()[0]
+
+    def step(status, remaining, total):
+        stats.pages = total - remaining
+        if progress is not None:
+            progress(stats, total)
+
+    started = time.perf_counter()
+    source.backup(
+        target,
+        pages=settings.BACKUP_PAGES,
+        progress=step,
+        sleep=settings.BACKUP_SLEEP,
+    )
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def dump(source, output):
+    """
+    SQL-дамп базы потоком в gzip: несжатая копия на диск не пишется.
+
+    Дамп читается в одной транзакции, чтобы все таблицы были из одного
+    снимка. В режиме WAL запись при этом продолжается, с журналом
+    rollback - ждёт конца дампа.
+    """
+    stats = BackupStats()
+    started = time.perf_counter()
+    source.execute('BEGIN')
+    try:
+        stats.page_size = source.execute('PRAGMA page_size').fetchone()[0]
+        stats.pages = source.execute('PRAGMA page_count').fetchone()[0]
+        with gzip.open(
+            output, 'wt', encoding='utf-8',
+            compresslevel=settings.BACKUP_COMPRESSION_LEVEL,
+        ) as target:
+            for statement in source.iterdump():
+                target.write(statement + '\n')
+    finally:
+        source.execute('ROLLBACK')
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def load(path, target):
+    """Выполняет сжатый дамп в target по одному оператору."""
+    statement = ''
+    with gzip.open(path, 'rt', encoding='utf-8') as source:
+        for line in source:
+            statement += line
+            if sqlite3.complete_statement(statement):
+                target.execute(statement)
+                statement = ''
+
+
+def backup(connection, output, progress=None):
+    """
+    Снимок базы в output.
+
+    При суффиксе .gz пишется сжатый SQL-дамп, иначе - копия файла базы
+    онлайн-API бэкапа. Под именем output файл появляется только целиком.
+    """
+    directory = os.path.dirname(os.path.abspath(output))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=directory)
+    os.close(descriptor)
+    try:
+        if output.endswith(COMPRESSED_SUFFIX):
+            stats = dump(connection, temp_path)
+        else:
+            target = sqlite3.connect(temp_path)
+            try:
+                stats = copy_pages(connection, target, progress)
+            finally:
+                target.close()
+        os.replace(temp_path, output)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return stats
+
+
+@contextmanager
+def opened(path):
+    """Открывает снимок; сжатый дамп разворачивается во временную базу."""
+    if not path.endswith(COMPRESSED_SUFFIX):
+        database = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        try:
+            yield database
+        finally:
+            database.close()
+        return
+    with tempfile.NamedTemporaryFile(suffix='.sqlite3') as temp:
+        # Без неявных транзакций: BEGIN и COMMIT есть в самом дампе.
+        database = sqlite3.connect(temp.name, isolation_level=None)
+        try:
+            load(path, database)
+            yield database
+        finally:
+            database.close()
+
+
+def verify(database):
+    """Пустой список, если PRAGMA integrity_check не нашла ошибок."""
+    try:
+        rows = [
+            row[0] for row in database.execute('PRAGMA integrity_check')
+        ]
+    except sqlite3.DatabaseError as error:
+        return [str(error)]
+    return [] if rows == ['ok'] else rows
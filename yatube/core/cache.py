@@ -0,0 +1,136 @@
+import functools
+import hashlib
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from django.utils.cache import patch_response_headers
+
+GENERATION_KEY = 'page:generation:{}'
+PAGE_KEY = 'page:{}:{}'
+LOCK_KEY = '{}:lock'
+
+
+def generation(model):
+    return cache.get_or_set(
+        GENERATION_KEY.format(model._meta.label_lower), 1, None
+    )
+
+
+def bump_generation(sender, **kwargs):
+    key = GENERATION_KEY.format(sender._meta.label_lower)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+
+
+def page_key(request, depends_on):
+    versions = '.'.join(str(generation(model)) for model in depends_on)
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return PAGE_KEY.format(versions, path)
+
+
+def render_and_store(view, request, args, kwargs, key, timeout):
+    response = view(request, *args, **kwargs)
+    if response.status_code == 200 and not response.streaming:
+        now = time.time()
+        cache.set(
+            key,
+            (response.content, response['Content-Type'], now + timeout),
+            timeout + settings.PAGE_CACHE_MAX_STALE,
+        )
+    return response
+
+
+def release(lock_key, token):
+    # Блокировка могла истечь и достаться другому воркеру: снимаем
+    # только свою. Между get и delete остаётся узкое окно, атомарного
+    # сравнения с удалением у кеша Django нет.
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def render_locked(view, request, args, kwargs, key, timeout):
+    """Строит страницу под блокировкой или None, если её держит другой."""
+    lock_key = LOCK_KEY.format(key)
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key, token, settings.PAGE_CACHE_LOCK_TIMEOUT):
+        return None
+    try:
+        response = render_and_store(view, request, args, kwargs, key, timeout)
+    finally:
+        release(lock_key, token)
+    if response.status_code == 200:
+        patch_response_headers(response, timeout)
+    return response
+
+
+def wait_for_entry(key, lock_key):
+    deadline = time.monotonic() + settings.PAGE_CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(settings.PAGE_CACHE_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None or cache.get(lock_key) is None:
+            # Блокировку сняли без записи (например, ответ не 200):
+            # ждать больше нечего.
+            return entry
+    return None
+
+
+def shared_cache_page(timeout, depends_on=()):
+    """
+    Кеширует страницу одну на всех пользователей.
+
+    Персональные части страницы выносятся во фрагменты, которые
+    FragmentMiddleware подставляет уже после кеша. Изменение любой
+    модели из depends_on сбрасывает все страницы, зависящие от неё.
+
+    Устаревшая копия ещё PAGE_CACHE_MAX_STALE секунд отдаётся, пока
+    один воркер под блокировкой в кеше строит новую; при полном промахе
+    остальные запросы ждут его результат, а не строят страницу сами.
+    """
+    for model in depends_on:
+        post_save.connect(bump_generation, sender=model)
+        post_delete.connect(bump_generation, sender=model)
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            key = page_key(request, depends_on)
+            lock_key = LOCK_KEY.format(key)
+            entry = cache.get(key)
+            if entry is None or entry[2] <= time.time():
+                response = render_locked(
+                    view, request, args, kwargs, key, timeout
+                )
+                if response is not None:
+                    return response
+                if entry is None:
+                    entry = wait_for_entry(key, lock_key)
+                if entry is None:
+                    return view(request, *args, **kwargs)
+            content, content_type, _ = entry
+            response = HttpResponse(content, content_type=content_type)
+            patch_response_headers(response, timeout)
+            return response
+        wrapper.cache_depends_on = depends_on
+        return wrapper
+    return decorator
+
+
+def cached_page(request, view):
+    """Любая, даже устаревшая, копия страницы из кеша или None."""
+    depends_on = getattr(view, 'cache_depends_on', None)
+    if depends_on is None:
+        return None
+    entry = cache.get(page_key(request, depends_on))
+    if entry is None:
+        return None
+    content, content_type, _ = entry
+    return HttpResponse(content, content_type=content_type)
@@ -0,0 +1,78 @@
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def encoding_weights(header):
+    """q-значения кодировок из Accept-Encoding."""
+    weights = {}
+    for part in header.split(','):
+        coding, *params = part.split(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.strip().partition('=')
+            if name.lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    return weights
+
+
+def preferred(header, codings):
+    """
+    Кодировка из codings с наибольшим q, None - если все отклонены.
+
+    '*' покрывает только неназванные кодировки, явное q=0 его отменяет.
+    При равных q выигрывает стоящая раньше в codings.
+    """
+    weights = encoding_weights(header)
+    best, best_weight = None, 0
+    for coding in codings:
+        weight = weights.get(coding, weights.get('*', 0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def available():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(header):
+    return preferred(header, available())
+
+
+def compress(data, coding, level):
+    if coding == 'br':
+        return brotli.compress(data, quality=level)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks, coding, level):
+    # Каждый кусок сбрасывается сразу, чтобы потоковый ответ
+    # доходил до клиента по мере генерации, а не одним блоком.
+    if coding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
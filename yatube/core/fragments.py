@@ -0,0 +1,94 @@
+import inspect
+import json
+import re
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+MARKER = '<!--fragment:{}:{}-->'
+MARKER_RE = re.compile(rb'<!--fragment:([\w-]+):([\w=-]*)-->')
+SSI = '<!--# include virtual="{}" -->'
+
+registry = {}
+
+
+def register(name, **converters):
+    """
+    Регистрирует функцию, рисующую персональный фрагмент страницы.
+
+    converters приводят параметры от клиента к нужному типу и бросают
+    ValueError или TypeError на неподходящее значение.
+    """
+    def decorator(func):
+        registry[name] = func, converters
+        return func
+    return decorator
+
+
+def object_id(value):
+    """id объекта: только положительное целое из JSON."""
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f'некорректный id: {value!r}')
+    return value
+
+
+def encode(kwargs):
+    return urlsafe_base64_encode(json.dumps(kwargs).encode())
+
+
+class BadFragment(ValueError):
+    """Параметры фрагмента не разобрать или они не подходят функции."""
+
+
+def decode(payload):
+    if not payload:
+        return {}
+    try:
+        kwargs = json.loads(urlsafe_base64_decode(payload))
+    except ValueError as error:
+        raise BadFragment(error)
+    if not isinstance(kwargs, dict):
+        raise BadFragment('ожидается объект JSON')
+    return kwargs
+
+
+def marker(name, kwargs):
+    return MARKER.format(name, encode(kwargs))
+
+
+def render_fragment(request, name, kwargs):
+    func, converters = registry[name]
+    try:
+        # Параметры приходят от клиента: лишние и пропущенные - ошибка,
+        # значения приводятся до того, как попадут в reverse() и ORM.
+        inspect.signature(func).bind(request, **kwargs)
+        kwargs = {
+            key: converters[key](value) if key in converters else value
+            for key, value in kwargs.items()
+        }
+    except (TypeError, ValueError) as error:
+        raise BadFragment(error)
+    return func(request, **kwargs)
+
+
+def fill(request, content, ssi=None):
+    """Подставляет вместо меток фрагменты для текущего пользователя."""
+    if ssi is None:
+        ssi = settings.FRAGMENTS_SSI
+
+    def replace(match):
+        name, payload = match.group(1).decode(), match.group(2).decode()
+        if ssi:
+            url = reverse('fragment', args=[name]) + f'?p={payload}'
+            return SSI.format(url).encode()
+        return render_fragment(request, name, decode(payload)).encode()
+    return MARKER_RE.sub(replace, content)
+
+
+@register('header')
+def header(request, view_name=None):
+    return render_to_string(
+        'includes/header.html', {'view_name': view_name}, request
+    )
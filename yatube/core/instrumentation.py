@@ -0,0 +1,157 @@
+import functools
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.template.base import Template
+from django.utils.module_loading import import_string
+
+_local = threading.local()
+_installed = False
+
+
+class RequestStats:
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.thumbnail_time = 0.0
+
+
+def current():
+    return getattr(_local, 'stats', None)
+
+
+def _record_query(execute, sql, params, many, context):
+    stats = current()
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_time += time.perf_counter() - started
+
+
+@contextmanager
+def collect():
+    """Собирает статистику запроса в текущем потоке."""
+    outer = current()
+    if outer is not None:
+        # Вложенные сборщики (метрики, Server-Timing) делят одну запись.
+        yield outer
+        return
+    stats = RequestStats()
+    _local.stats = stats
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(_record_query))
+            yield stats
+    finally:
+        _local.stats = outer
+
+
+def _wrap_template_render(render):
+    @functools.wraps(render)
+    def wrapper(self, context):
+        stats = current()
+        if stats is None:
+            return render(self, context)
+        # Вложенные include считаются в составе внешнего шаблона.
+        stats.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            stats.template_depth -= 1
+            if not stats.template_depth:
+                stats.template_time += time.perf_counter() - started
+    wrapper.instrumented = True
+    return wrapper
+
+
+def _wrap_cache_get(get):
+    @functools.wraps(get)
+    def wrapper(self, key, default=None, version=None):
+        stats = current()
+        if stats is None or getattr(_local, 'in_get_many', False):
+            # BaseCache.get_many вызывает get, ключи считает get_many.
+            return get(self, key, default, version)
+        started = time.perf_counter()
+        value = get(self, key, default, version)
+        stats.cache_time += time.perf_counter() - started
+        if value is default:
+            stats.cache_misses += 1
+        else:
+            stats.cache_hits += 1
+        return value
+    wrapper.instrumented = True
+    return wrapper
+
+
+def _wrap_cache_get_many(get_many):
+    @functools.wraps(get_many)
+    def wrapper(self, keys, version=None):
+        stats = current()
+        if stats is None:
+            return get_many(self, keys, version)
+        keys = list(keys)
+        started = time.perf_counter()
+        _local.in_get_many = True
+        try:
+            values = get_many(self, keys, version)
+        finally:
+            _local.in_get_many = False
+        stats.cache_time += time.perf_counter() - started
+        stats.cache_hits += len(values)
+        stats.cache_misses += len(keys) - len(values)
+        return values
+    wrapper.instrumented = True
+    return wrapper
+
+
+def _wrap_get_thumbnail(get_thumbnail):
+    @functools.wraps(get_thumbnail)
+    def wrapper(self, *args, **kwargs):
+        stats = current()
+        started = time.perf_counter()
+        try:
+            return get_thumbnail(self, *args, **kwargs)
+        finally:
+            if stats is not None:
+                stats.thumbnail_time += time.perf_counter() - started
+    wrapper.instrumented = True
+    return wrapper
+
+
+def _patch(cls, name, wrap):
+    method = getattr(cls, name)
+    if not getattr(method, 'instrumented', False):
+        setattr(cls, name, wrap(method))
+
+
+def install():
+    """Подключает замеры шаблонов, кеша и миниатюр; вызывается один раз."""
+    global _installed
+    if _installed:
+        return
+    from sorl.thumbnail.conf import settings as thumbnail_settings
+
+    _patch(Template, 'render', _wrap_template_render)
+    _patch(
+        import_string(thumbnail_settings.THUMBNAIL_BACKEND),
+        'get_thumbnail',
+        _wrap_get_thumbnail,
+    )
+    for options in settings.CACHES.values():
+        backend = import_string(options['BACKEND'])
+        _patch(backend, 'get', _wrap_cache_get)
+        _patch(backend, 'get_many', _wrap_cache_get_many)
+    _installed = True
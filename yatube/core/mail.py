@@ -0,0 +1,43 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_pid = None
+
+
+def get_executor():
+    # Пул создаётся заново после fork: потоки родителя в воркер не переходят.
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.BACKGROUND_EMAIL_WORKERS,
+            thread_name_prefix='email',
+        )
+        _executor_pid = os.getpid()
+    return _executor
+
+
+def send(messages, fail_silently):
+    try:
+        get_connection(
+            settings.BACKGROUND_EMAIL_BACKEND, fail_silently=fail_silently
+        ).send_messages(messages)
+    except Exception:
+        logger.exception('Не удалось отправить %d писем', len(messages))
+
+
+class BackgroundEmailBackend(BaseEmailBackend):
+    """Отправляет письма в фоновом потоке, не задерживая ответ."""
+
+    def send_messages(self, email_messages):
+        messages = list(email_messages)
+        if messages:
+            get_executor().submit(send, messages, self.fail_silently)
+        return len(messages)
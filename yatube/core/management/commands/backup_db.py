@@ -0,0 +1,59 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from ...backup import COMPRESSED_SUFFIX, backup, opened, verify
+
+
+class Command(BaseCommand):
+    help = (
+        'Снимает копию SQLite-базы без остановки сайта через онлайн-API '
+        'бэкапа: копирование идёт шагами по BACKUP_PAGES страниц, между '
+        'шагами запись в базу продолжается.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--output', default=None)
+        parser.add_argument('--compress', action='store_true',
+                            help='Записать вместо копии файла SQL-дамп, '
+                                 'сжатый gzip на лету: места нужно только '
+                                 'под сжатый результат.')
+        parser.add_argument('--verify', action='store_true',
+                            help='Проверить целостность снимка.')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError('backup_db работает только с SQLite.')
+        output = options['output'] or os.path.join(
+            settings.BACKUP_DIR,
+            f'{options["database"]}-'
+            f'{timezone.now():%Y%m%d-%H%M%S}.sqlite3',
+        )
+        if options['compress'] and not output.endswith(COMPRESSED_SUFFIX):
+            output += COMPRESSED_SUFFIX
+        connection.ensure_connection()
+        self.reported = 0.0
+        stats = backup(connection.connection, output, self.progress)
+        self.stdout.write(
+            f'{output}: {stats.bytes / 1024 / 1024:.1f} МБ за '
+            f'{stats.seconds:.2f} с, {stats.throughput:.1f} МБ/с, '
+            f'на диске {os.path.getsize(output) / 1024 / 1024:.1f} МБ'
+        )
+        if options['verify']:
+            with opened(output) as database:
+                errors = verify(database)
+            if errors:
+                raise CommandError('\n'.join(errors))
+            self.stdout.write(self.style.SUCCESS('Целостность: ok'))
+
+    def progress(self, stats, total):
+        now = time.monotonic()
+        if now - self.reported >= 1 or stats.pages == total:
+            self.reported = now
+            self.stdout.write(f'  {stats.pages}/{total} страниц')
@@ -0,0 +1,54 @@
+import json
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from ...compression import available, compress
+
+LEVELS = {'gzip': (1, 6, 9), 'br': (1, 5, 11)}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает затраты CPU и экономию байтов при сжатии '
+        'типичной страницы разными алгоритмами и уровнями.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/')
+        parser.add_argument('--repeat', type=int, default=200)
+        parser.add_argument('--output', default=None)
+
+    def handle(self, *args, **options):
+        cache.clear()
+        response = Client().get(options['path'])
+        if response.status_code != 200:
+            raise CommandError(
+                f'{options["path"]} вернул {response.status_code}'
+            )
+        content = response.content
+        report = {'path': options['path'], 'bytes': len(content), 'runs': []}
+        self.stdout.write(f'{options["path"]}: {len(content)} байт')
+        for coding in available():
+            for level in LEVELS[coding]:
+                started = time.process_time()
+                for _ in range(options['repeat']):
+                    compressed = compress(content, coding, level)
+                cpu = (time.process_time() - started) / options['repeat']
+                row = {
+                    'coding': coding,
+                    'level': level,
+                    'bytes': len(compressed),
+                    'saved': round(1 - len(compressed) / len(content), 4),
+                    'cpu_ms': round(cpu * 1000, 4),
+                }
+                report['runs'].append(row)
+                self.stdout.write(
+                    f'{coding:<5} {level:>2}: {row["bytes"]:>8} байт '
+                    f'(-{row["saved"]:.1%}), {row["cpu_ms"]:.3f} мс CPU'
+                )
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2, ensure_ascii=False)
@@ -0,0 +1,70 @@
+import json
+import logging
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from posts.management.commands.bench_views import PERCENTILES, percentile
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность страницы 404 при отрисовке '
+        'шаблона на каждый запрос и при отдаче готового тела.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/missing-page/')
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--output', default=None)
+
+    def handle(self, *args, **options):
+        # Предупреждение на каждый 404 исказило бы замер.
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        clients = {'anonymous': Client()}
+        user = get_user_model().objects.order_by('pk').first()
+        if user is not None:
+            clients['authorized'] = Client()
+            clients['authorized'].force_login(user)
+        report = {'path': options['path'], 'runs': []}
+        for mode, static in (('live', False), ('static', True)):
+            # При DEBUG Django рисует свою отладочную страницу 404.
+            with override_settings(DEBUG=False, STATIC_ERROR_PAGES=static):
+                for name, client in clients.items():
+                    row = self.measure(client, options)
+                    row.update(mode=mode, client=name)
+                    report['runs'].append(row)
+                    self.stdout.write(
+                        f'{mode:<6} {name:<10} {row["rps"]:>8.1f} rps '
+                        f'p50={row["p50_ms"]:.2f}ms '
+                        f'p99={row["p99_ms"]:.2f}ms '
+                        f'queries={row["queries"]}'
+                    )
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2, ensure_ascii=False)
+
+    def measure(self, client, options):
+        for _ in range(options['warmup']):
+            client.get(options['path'])
+        timings = []
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            for _ in range(options['requests']):
+                request_started = time.perf_counter()
+                client.get(options['path'])
+                timings.append((time.perf_counter() - request_started) * 1000)
+            elapsed = time.perf_counter() - started
+        row = {
+            'requests': len(timings),
+            'rps': round(len(timings) / elapsed, 1),
+            'queries': round(len(captured) / len(timings), 2),
+        }
+        for percent in PERCENTILES:
+            row[f'p{percent}_ms'] = round(percentile(timings, percent), 3)
+        return row
@@ -0,0 +1,79 @@
+import json
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Выполняется в отдельном процессе, чтобы каждый замер начинался
+# с холодного интерпретатора, как у свежего воркера.
+PROBE = '''
+import io, json, os, sys, time
+from wsgiref.util import setup_testing_defaults
+
+def rss_kb():
+    with open('/proc/self/statm') as statm:
+        pages = int(statm.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+
+started = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+if sys.argv[1] == '1':
+    from core.warmup import warm_up
+    warm_up()
+boot = time.perf_counter() - started
+rss_boot = rss_kb()
+
+environ = {'PATH_INFO': sys.argv[2], 'wsgi.input': io.BytesIO()}
+setup_testing_defaults(environ)
+environ['HTTP_HOST'] = 'localhost'
+requested = time.perf_counter()
+body = application(environ, lambda status, headers: None)
+next(iter(body))
+ttfb = time.perf_counter() - requested
+print(json.dumps({
+    'boot_ms': boot * 1000,
+    'ttfb_ms': ttfb * 1000,
+    'rss_boot_kb': rss_boot,
+    'rss_after_request_kb': rss_kb(),
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время до первого байта и память процесса '
+        'с прогревом WSGI-приложения и без него.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/about/tech/')
+        parser.add_argument('--runs', type=int, default=3)
+        parser.add_argument('--output', default=None)
+
+    def probe(self, warm, path):
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE, '1' if warm else '0', path],
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr)
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def handle(self, *args, **options):
+        report = {}
+        for label, warm in (('cold', False), ('warm', True)):
+            runs = [
+                self.probe(warm, options['path'])
+                for _ in range(options['runs'])
+            ]
+            report[label] = {
+                key: round(min(run[key] for run in runs), 2)
+                for key in runs[0]
+            }
+            self.stdout.write(f'{label}: {report[label]}')
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
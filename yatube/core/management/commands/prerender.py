@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from ...prerender import page_path, render_static
+
+
+def write(template_name, content):
+    path = page_path(template_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(descriptor, 'wb') as temp:
+        temp.write(content)
+    os.replace(temp_path, path)
+
+
+class Command(BaseCommand):
+    help = (
+        'Заранее рисует страницы PRERENDERED_VIEWS и шаблоны '
+        'PRERENDERED_TEMPLATES в PRERENDER_ROOT. Запускается при деплое; '
+        'у страниц персональные фрагменты остаются метками и подставляются '
+        'при отдаче, шаблоны ошибок собираются целиком для анонима.'
+    )
+
+    def handle(self, *args, **options):
+        if settings.PRERENDER_ROOT is None:
+            raise CommandError('PRERENDER_ROOT не задан.')
+        factory = RequestFactory()
+        for name in settings.PRERENDERED_VIEWS:
+            url = reverse(name)
+            request = factory.get(url)
+            request.user = AnonymousUser()
+            request.resolver_match = match = resolve(url)
+            view = match.func.view_class(**match.func.view_initkwargs)
+            view.setup(request, *match.args, **match.kwargs)
+            response = view.render_live(
+                request, *match.args, **match.kwargs
+            ).render()
+            write(view.template_name, response.content)
+            self.stdout.write(f'{url} -> {view.template_name}')
+        for template_name in settings.PRERENDERED_TEMPLATES:
+            write(template_name, render_static(template_name))
+            self.stdout.write(template_name)
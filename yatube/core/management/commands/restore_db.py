@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from ...backup import copy_pages, opened, verify
+
+
+class Command(BaseCommand):
+    help = (
+        'Проверяет снимок backup_db и восстанавливает из него базу '
+        'тем же онлайн-API бэкапа SQLite.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--verify-only', action='store_true')
+        parser.add_argument('--noinput', '--no-input', action='store_false',
+                            dest='interactive')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError('restore_db работает только с SQLite.')
+        with opened(options['path']) as database:
+            errors = verify(database)
+            if errors:
+                raise CommandError('\n'.join(errors))
+            self.stdout.write(self.style.SUCCESS('Целостность: ok'))
+            if options['verify_only']:
+                return
+            if options['interactive'] and input(
+                f'База {options["database"]} будет перезаписана. '
+                'Введите "yes" для продолжения: '
+            ) != 'yes':
+                raise CommandError('Восстановление отменено.')
+            connection.ensure_connection()
+            stats = copy_pages(database, connection.connection)
+        self.stdout.write(
+            f'Восстановлено {stats.bytes / 1024 / 1024:.1f} МБ за '
+            f'{stats.seconds:.2f} с, {stats.throughput:.1f} МБ/с'
+        )
@@ -0,0 +1,136 @@
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied, SuspiciousFileOperation
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseNotModified
+)
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def is_public(name):
+    return name.startswith(settings.MEDIA_PUBLIC_PREFIXES)
+
+
+def parse_range(header, size):
+    """
+    Границы (start, end) включительно из заголовка Range.
+
+    None - диапазона нет или он составной, файл отдаётся целиком.
+    """
+    match = RANGE.match(header.strip())
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start:
+        if not end or not int(end):
+            raise RangeNotSatisfiable
+        return max(size - int(end), 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or end < start:
+        raise RangeNotSatisfiable
+    return start, end
+
+
+class RangeFile:
+    """Файл, из которого читается не больше length байт с позиции start."""
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size) if size else b''
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def file_response(request, path, size, content_type):
+    try:
+        bounds = parse_range(request.META.get('HTTP_RANGE', ''), size)
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    if bounds is None:
+        # Целый файл: WSGI-сервер отдаст его через sendfile без копирования
+        # в Python (wsgi.file_wrapper).
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+    else:
+        start, end = bounds
+        response = FileResponse(
+            RangeFile(open(path, 'rb'), start, end - start + 1),
+            status=206,
+            content_type=content_type,
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def serve(request, name):
+    """
+    Отдаёт файл из MEDIA_ROOT после проверки доступа.
+
+    С MEDIA_ACCEL сам файл отправляет фронтовой сервер: nginx по
+    X-Accel-Redirect во внутренний location MEDIA_ACCEL_PREFIX или
+    Apache/lighttpd по X-Sendfile.
+    """
+    # Доступ проверяется по нормализованному пути: иначе
+    # posts/../private/... прошёл бы как публичный.
+    name = posixpath.normpath(name)
+    if name.startswith(('../', '/')) or name in ('.', '..'):
+        raise Http404
+    if not is_public(name) and not request.user.is_staff:
+        raise PermissionDenied
+    try:
+        path = safe_join(settings.MEDIA_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(path):
+        raise Http404
+    stat = os.stat(path)
+    if not was_modified_since(
+        request.META.get('HTTP_IF_MODIFIED_SINCE'),
+        stat.st_mtime,
+        stat.st_size,
+    ):
+        return HttpResponseNotModified()
+    content_type, _ = mimetypes.guess_type(name)
+    content_type = content_type or 'application/octet-stream'
+    if settings.MEDIA_ACCEL == 'nginx':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX + quote(
+            name
+        )
+    elif settings.MEDIA_ACCEL == 'sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = path
+    else:
+        response = file_response(request, path, stat.st_size, content_type)
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = (
+        f'public, max-age={settings.MEDIA_MAX_AGE}' if is_public(name)
+        else 'private, no-cache'
+    )
+    return response
@@ -0,0 +1,155 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FILE_PREFIX = 'metrics-'
+
+COUNTERS = (
+    ('requests_total', 'Количество запросов.'),
+    ('db_queries_total', 'Количество SQL-запросов.'),
+    ('db_query_seconds_total', 'Время SQL-запросов.'),
+    ('cache_hits_total', 'Попадания в кеш.'),
+    ('cache_misses_total', 'Промахи кеша.'),
+    ('template_render_seconds_total', 'Время отрисовки шаблонов.'),
+)
+HISTOGRAM = ('request_duration_seconds', 'Время обработки запроса.')
+
+
+class Registry:
+    """Метрики процесса, периодически сбрасываемые в общий каталог."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+        self.last_flush = 0.0
+
+    def observe(self, view, status, duration, stats):
+        with self.lock:
+            row = self.views.get(view)
+            if row is None:
+                row = self.views[view] = {
+                    'statuses': {},
+                    'buckets': [0] * (len(BUCKETS) + 1),
+                    'duration_sum': 0.0,
+                    'db_queries_total': 0,
+                    'db_query_seconds_total': 0.0,
+                    'cache_hits_total': 0,
+                    'cache_misses_total': 0,
+                    'template_render_seconds_total': 0.0,
+                }
+            status = str(status)
+            row['statuses'][status] = row['statuses'].get(status, 0) + 1
+            row['buckets'][bisect_left(BUCKETS, duration)] += 1
+            row['duration_sum'] += duration
+            row['db_queries_total'] += stats.db_queries
+            row['db_query_seconds_total'] += stats.db_time
+            row['cache_hits_total'] += stats.cache_hits
+            row['cache_misses_total'] += stats.cache_misses
+            row['template_render_seconds_total'] += stats.template_time
+        self.maybe_flush()
+
+    def snapshot(self):
+        with self.lock:
+            return json.loads(json.dumps(self.views))
+
+    def maybe_flush(self, force=False):
+        directory = settings.METRICS_DIR
+        now = time.monotonic()
+        if directory is None or (
+            not force and now - self.last_flush < settings.METRICS_FLUSH
+        ):
+            return
+        self.last_flush = now
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(descriptor, 'w') as temp:
+            json.dump(self.snapshot(), temp)
+        os.replace(
+            temp_path,
+            os.path.join(directory, f'{FILE_PREFIX}{os.getpid()}.json')
+        )
+
+    def collect(self):
+        """Сводит метрики всех воркеров, свои берутся из памяти."""
+        self.maybe_flush(force=True)
+        directory = settings.METRICS_DIR
+        if directory is None or not os.path.isdir(directory):
+            return self.snapshot()
+        merged = {}
+        for name in os.listdir(directory):
+            if not name.startswith(FILE_PREFIX):
+                continue
+            try:
+                with open(os.path.join(directory, name)) as source:
+                    views = json.load(source)
+            except (OSError, ValueError):
+                continue
+            for view, row in views.items():
+                merge(merged, view, row)
+        return merged
+
+
+def merge(merged, view, row):
+    target = merged.setdefault(view, {
+        'statuses': {},
+        'buckets': [0] * len(row['buckets']),
+    })
+    for status, count in row['statuses'].items():
+        target['statuses'][status] = target['statuses'].get(status, 0) + count
+    target['buckets'] = [
+        total + count
+        for total, count in zip(target['buckets'], row['buckets'])
+    ]
+    for key, value in row.items():
+        if key not in ('statuses', 'buckets'):
+            target[key] = target.get(key, 0) + value
+
+
+def label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def render_prometheus(views):
+    lines = []
+    name, help_text = HISTOGRAM
+    lines.append(f'# HELP yatube_{name} {help_text}')
+    lines.append(f'# TYPE yatube_{name} histogram')
+    for view, row in sorted(views.items()):
+        cumulative = 0
+        bounds = [str(bound) for bound in BUCKETS] + ['+Inf']
+        for bound, count in zip(bounds, row['buckets']):
+            cumulative += count
+            lines.append(
+                f'yatube_{name}_bucket{{view="{label(view)}",le="{bound}"}} '
+                f'{cumulative}'
+            )
+        lines.append(
+            f'yatube_{name}_sum{{view="{label(view)}"}} {row["duration_sum"]}'
+        )
+        lines.append(
+            f'yatube_{name}_count{{view="{label(view)}"}} {cumulative}'
+        )
+    for name, help_text in COUNTERS:
+        lines.append(f'# HELP yatube_{name} {help_text}')
+        lines.append(f'# TYPE yatube_{name} counter')
+        for view, row in sorted(views.items()):
+            if name == 'requests_total':
+                for status, count in sorted(row['statuses'].items()):
+                    lines.append(
+                        f'yatube_{name}{{view="{label(view)}",'
+                        f'status="{status}"}} {count}'
+                    )
+            else:
+                lines.append(
+                    f'yatube_{name}{{view="{label(view)}"}} {row[name]}'
+                )
+    return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from ..compression import compress, compress_stream, negotiate
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript',
+    'application/xml', 'image/svg+xml',
+)
+
+
+class CompressionMiddleware:
+    """Сжатие ответов gzip/brotli, в том числе потоковых."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.has_header('Content-Encoding')
+            or response.status_code == 206
+            or not response.get('Content-Type', '').startswith(
+                COMPRESSIBLE_TYPES
+            )
+            or not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if coding is None:
+            return response
+        level = settings.COMPRESSION_LEVELS[coding]
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content, coding, level
+            )
+            del response['Content-Length']
+        else:
+            compressed = compress(response.content, coding, level)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = coding
+        return response
@@ -0,0 +1,21 @@
+from ..fragments import MARKER_RE, fill
+
+
+class FragmentMiddleware:
+    """Вставляет персональные фрагменты в общую для всех страницу."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.streaming
+            or not response.get('Content-Type', '').startswith('text/html')
+            or not MARKER_RE.search(response.content)
+        ):
+            return response
+        response.content = fill(request, response.content)
+        if response.has_header('Content-Length'):
+            response['Content-Length'] = str(len(response.content))
+        return response
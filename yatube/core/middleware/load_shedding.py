@@ -0,0 +1,117 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+
+from .. import instrumentation
+from ..cache import cached_page
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PROBE_KEY = 'load_shedding:probe'
+
+
+class DatabaseBreaker:
+    """Размыкается, когда средняя задержка запроса к БД превышает порог."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = 0.0
+        self.state = CLOSED
+        self.open_until = 0.0
+
+    def record(self, stats, probe=False):
+        if probe:
+            cache.delete(PROBE_KEY)
+        if not stats.db_queries:
+            return
+        sample = stats.db_time / stats.db_queries * 1000
+        alpha = settings.LOAD_SHEDDING_SMOOTHING
+        with self.lock:
+            if self.state == HALF_OPEN:
+                if not probe:
+                    # Решает только пробный запрос.
+                    return
+                # Прошлое среднее накоплено под нагрузкой и ещё
+                # долго бы держалось.
+                self.latency = sample
+            else:
+                self.latency = alpha * sample + (1 - alpha) * self.latency
+            overloaded = self.latency > settings.LOAD_SHEDDING_DB_LATENCY
+            if overloaded and self.state != OPEN:
+                self.state = OPEN
+                self.open_until = time.monotonic() + (
+                    settings.LOAD_SHEDDING_COOLDOWN
+                )
+            elif not overloaded and self.state == HALF_OPEN:
+                self.state = CLOSED
+
+    def current(self):
+        with self.lock:
+            if self.state == OPEN and time.monotonic() >= self.open_until:
+                self.state = HALF_OPEN
+            return self.state
+
+    def try_probe(self):
+        # В БД пропускается один пробный запрос; с общим кешем -
+        # один на все воркеры.
+        return cache.add(PROBE_KEY, 1, settings.LOAD_SHEDDING_COOLDOWN)
+
+
+breaker = DatabaseBreaker()
+
+
+def unavailable():
+    response = HttpResponse(
+        'Сервис перегружен, попробуйте позже.', status=503,
+        content_type='text/plain; charset=utf-8',
+    )
+    response['Retry-After'] = str(settings.LOAD_SHEDDING_COOLDOWN)
+    return response
+
+
+class LoadSheddingMiddleware:
+    """Деградация при медленной БД: кеш для чтения, 503 для остального."""
+
+    def __init__(self, get_response):
+        if settings.LOAD_SHEDDING_DB_LATENCY is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with instrumentation.collect() as stats:
+            response = self.get_response(request)
+        breaker.record(
+            stats, probe=getattr(request, 'load_shedding_probe', False)
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.resolver_match.view_name
+            in settings.LOAD_SHEDDING_EXEMPT_VIEWS
+            or request.path.startswith(
+                (settings.STATIC_URL, settings.MEDIA_URL)
+            )
+        ):
+            return None
+        state = breaker.current()
+        if state == CLOSED:
+            return None
+        if state == HALF_OPEN and breaker.try_probe():
+            request.load_shedding_probe = True
+            return None
+        if request.method not in SAFE_METHODS:
+            return unavailable()
+        if request.resolver_match.view_name in (
+            settings.LOAD_SHEDDING_EXPENSIVE_VIEWS
+        ):
+            return unavailable()
+        response = cached_page(request, view_func)
+        if response is None:
+            return unavailable()
+        response['Warning'] = '110 - "Response is stale"'
+        return response
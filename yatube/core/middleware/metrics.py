@@ -0,0 +1,31 @@
+import time
+
+from .. import instrumentation
+from ..metrics import registry
+
+UNRESOLVED = '<unresolved>'
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None or not match.view_name:
+        return UNRESOLVED
+    return match.view_name
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        instrumentation.install()
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with instrumentation.collect() as stats:
+            response = self.get_response(request)
+        registry.observe(
+            view_name(request),
+            response.status_code,
+            time.perf_counter() - started,
+            stats,
+        )
+        return response
@@ -0,0 +1,71 @@
+import cProfile
+import io
+import pstats
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse
+from django.test.utils import CaptureQueriesContext
+
+from ..routers import read_databases
+
+PROFILE_PARAM = '_profile'
+SORT_KEYS = ('cumulative', 'tottime', 'calls', 'ncalls', 'time')
+
+
+class ProfilerMiddleware:
+    """Отчёт cProfile вместо страницы для персонала по ?_profile=1."""
+
+    def __init__(self, get_response):
+        if not settings.PROFILER_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (
+            PROFILE_PARAM not in request.GET
+            or not request.user.is_staff
+        ):
+            return self.get_response(request)
+        sort = request.GET.get('_sort', 'cumulative')
+        if sort not in SORT_KEYS:
+            sort = 'cumulative'
+        try:
+            limit = int(request.GET.get('_limit', settings.PROFILER_LIMIT))
+        except ValueError:
+            limit = settings.PROFILER_LIMIT
+        profiler = cProfile.Profile()
+        with ExitStack() as stack:
+            captured = [
+                stack.enter_context(CaptureQueriesContext(connections[alias]))
+                # Несконфигурированные псевдонимы не открываем.
+                for alias in read_databases()
+            ]
+            response = profiler.runcall(self.get_response, request)
+        return HttpResponse(
+            self.report(request, response, profiler, sort, limit, captured),
+            content_type='text/plain; charset=utf-8',
+        )
+
+    def report(self, request, response, profiler, sort, limit, captured):
+        output = io.StringIO()
+        output.write(
+            f'{request.method} {request.get_full_path()} '
+            f'-> {response.status_code}\n\n'
+        )
+        stats = pstats.Stats(profiler, stream=output)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        for context in captured:
+            queries = context.captured_queries
+            total = sum(float(query['time']) for query in queries)
+            output.write(
+                f'\nSQL ({context.connection.alias}): {len(queries)} '
+                f'запросов, {total * 1000:.1f} мс\n'
+            )
+            for query in queries:
+                output.write(
+                    f'{float(query["time"]) * 1000:8.1f} мс  {query["sql"]}\n'
+                )
+        return output.getvalue()
@@ -0,0 +1,48 @@
+import math
+
+from django.conf import settings
+from django.http import HttpResponse
+
+from ..ratelimit import WINDOW_KEY, FixedWindow
+
+DEFAULT_METHODS = ('POST',)
+
+
+def client_key(request, policy):
+    if policy.get('key') == 'user' and request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return f'ip:{request.META.get("REMOTE_ADDR", "")}'
+
+
+def too_many_requests(retry_after):
+    response = HttpResponse(
+        'Слишком много запросов, попробуйте позже.', status=429,
+        content_type='text/plain; charset=utf-8',
+    )
+    response['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+class RateLimitMiddleware:
+    """Ограничение частоты запросов по политикам из RATE_LIMITS."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_name = request.resolver_match.view_name
+        policy = settings.RATE_LIMITS.get(view_name)
+        if policy is None or request.method not in policy.get(
+            'methods', DEFAULT_METHODS
+        ):
+            return None
+        limiter = FixedWindow(policy['burst'], policy['rate'])
+        allowed, retry_after = limiter.consume(
+            WINDOW_KEY.format(view_name, client_key(request, policy))
+        )
+        if allowed:
+            return None
+        return too_many_requests(retry_after)
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from .. import routers
+
+STICKY_KEY = 'replica:sticky:{}'
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+def sticky_key(request):
+    if request.user.is_authenticated:
+        return STICKY_KEY.format(request.user.pk)
+    return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Направляет чтение страниц из REPLICA_READ_VIEWS на реплики.
+
+    После записи пользователь REPLICA_STICKY_SECONDS читает из основной
+    БД, чтобы сразу увидеть свои изменения, которые реплика ещё
+    не получила.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        routers.use_replica(False)
+        try:
+            response = self.get_response(request)
+            if routers.wrote():
+                key = sticky_key(request)
+                if key is not None:
+                    cache.set(key, True, settings.REPLICA_STICKY_SECONDS)
+            return response
+        finally:
+            routers.use_replica(False)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in SAFE_METHODS
+            and request.resolver_match.view_name
+            in settings.REPLICA_READ_VIEWS
+        ):
+            key = sticky_key(request)
+            routers.use_replica(key is None or not cache.get(key))
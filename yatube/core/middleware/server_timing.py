@@ -0,0 +1,57 @@
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .. import instrumentation
+from .metrics import view_name
+
+logger = logging.getLogger(__name__)
+
+
+def format_server_timing(phases):
+    return ', '.join(
+        f'{name};dur={duration * 1000:.1f};desc="{description}"'
+        for name, duration, description in phases
+    )
+
+
+class ServerTimingMiddleware:
+    """Разбивка времени запроса по фазам в заголовке Server-Timing."""
+
+    def __init__(self, get_response):
+        if not settings.SERVER_TIMING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instrumentation.install()
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with instrumentation.collect() as stats:
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+        phases = [
+            ('db', stats.db_time, f'{stats.db_queries} queries'),
+            ('cache', stats.cache_time,
+             f'{stats.cache_hits} hits, {stats.cache_misses} misses'),
+            ('tpl', stats.template_time, 'templates'),
+            ('thumb', stats.thumbnail_time, 'thumbnails'),
+            ('total', total, 'total'),
+        ]
+        response['Server-Timing'] = format_server_timing(phases)
+        logger.info(json.dumps({
+            'view': view_name(request),
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'db_queries': stats.db_queries,
+            'cache_hits': stats.cache_hits,
+            'cache_misses': stats.cache_misses,
+            **{
+                f'{name}_ms': round(duration * 1000, 3)
+                for name, duration, _ in phases
+            },
+        }))
+        return response
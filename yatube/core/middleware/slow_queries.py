@@ -0,0 +1,107 @@
+import json
+import logging
+import os
+import random
+import time
+import traceback
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .. import instrumentation
+from .metrics import view_name
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_PREFIXES = {
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'postgresql': 'EXPLAIN ',
+    'mysql': 'EXPLAIN ',
+}
+STACK_DEPTH = 6
+INTERNAL = (os.path.dirname(__file__), instrumentation.__file__)
+
+
+def stack_summary():
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if frame.filename.startswith(settings.BASE_DIR)
+        and 'site-packages' not in frame.filename
+        and not frame.filename.startswith(INTERNAL)
+    ]
+    return [
+        f'{frame.filename[len(settings.BASE_DIR) + 1:]}:{frame.lineno} '
+        f'in {frame.name}'
+        for frame in frames[-STACK_DEPTH:]
+    ]
+
+
+class SlowQueryLogger:
+    def __init__(self, request):
+        self.request = request
+        self.explained = 0
+        self.explaining = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.explaining:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - started) * 1000
+            if duration >= settings.SLOW_QUERY_THRESHOLD:
+                self.log(context['connection'], sql, params, many, duration)
+
+    def explain(self, connection, sql, params):
+        prefix = EXPLAIN_PREFIXES.get(connection.vendor)
+        if (
+            prefix is None
+            or not sql.lstrip().upper().startswith('SELECT')
+            or self.explained >= settings.SLOW_QUERY_EXPLAIN_LIMIT
+        ):
+            return None
+        self.explained += 1
+        self.explaining = True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(prefix + sql, params)
+                return [
+                    ' '.join(str(column) for column in row)
+                    for row in cursor.fetchall()
+                ]
+        except Exception as error:
+            return [f'EXPLAIN failed: {error}']
+        finally:
+            self.explaining = False
+
+    def log(self, connection, sql, params, many, duration):
+        logger.warning(json.dumps({
+            'view': view_name(self.request),
+            'path': self.request.path,
+            'database': connection.alias,
+            'duration_ms': round(duration, 3),
+            'sql': sql,
+            'plan': None if many else self.explain(connection, sql, params),
+            'stack': stack_summary(),
+        }, ensure_ascii=False, default=str))
+
+
+class SlowQueryMiddleware:
+    """Логирует медленные запросы к БД с планом выполнения."""
+
+    def __init__(self, get_response):
+        if settings.SLOW_QUERY_THRESHOLD is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.SLOW_QUERY_SAMPLE_RATE:
+            return self.get_response(request)
+        wrapper = SlowQueryLogger(request)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(wrapper))
+            return self.get_response(request)
@@ -0,0 +1,64 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import FileResponse
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+
+from ..compression import preferred
+
+# ManifestStaticFilesStorage добавляет к имени 12 символов md5.
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^/]+$')
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+class StaticFilesMiddleware:
+    """Отдаёт собранную статику с предсжатыми копиями и долгим кешем."""
+
+    def __init__(self, get_response):
+        if not settings.SERVE_STATIC:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (
+            request.method not in ('GET', 'HEAD')
+            or not request.path.startswith(settings.STATIC_URL)
+        ):
+            return self.get_response(request)
+        name = request.path[len(settings.STATIC_URL):]
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except SuspiciousFileOperation:
+            return self.get_response(request)
+        if not os.path.isfile(path):
+            return self.get_response(request)
+        return self.serve(request, name, path)
+
+    def serve(self, request, name, path):
+        encoding = preferred(
+            request.META.get('HTTP_ACCEPT_ENCODING', ''),
+            [
+                coding for coding, suffix in ENCODINGS
+                if os.path.isfile(path + suffix)
+            ],
+        )
+        if encoding:
+            path += dict(ENCODINGS)[encoding]
+        content_type, _ = mimetypes.guess_type(name)
+        response = FileResponse(
+            open(path, 'rb'),
+            content_type=content_type or 'application/octet-stream',
+        )
+        if encoding:
+            response['Content-Encoding'] = encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        response['Cache-Control'] = (
+            IMMUTABLE if HASHED_NAME.search(name)
+            else f'public, max-age={settings.STATIC_MAX_AGE}'
+        )
+        return response
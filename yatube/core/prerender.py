@@ -0,0 +1,92 @@
+import hashlib
+import os
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response
+
+from .context_processors.year import year
+from .fragments import fill
+
+# Подставляется вместо запрошенного адреса при сборке страницы 404.
+PATH_PLACEHOLDER = '__request_path__'
+
+_pages = {}
+_static_pages = {}
+
+
+def page_path(template_name):
+    return os.path.join(settings.PRERENDER_ROOT, template_name)
+
+
+def load(template_name):
+    """Готовая страница и её хеш; None, если сборки ещё не было."""
+    if settings.PRERENDER_ROOT is None:
+        return None
+    path = page_path(template_name)
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    page = _pages.get(path)
+    if page is None or page[0] != mtime:
+        with open(path, 'rb') as source:
+            content = source.read()
+        page = _pages[path] = (
+            mtime, content, hashlib.md5(content).hexdigest()
+        )
+    return page[1:]
+
+
+def render_static(template_name):
+    """
+    Страница без запроса: без контекст-процессоров, сессии и БД.
+
+    Шапка сразу рисуется для анонима, поэтому при отдаче страницы
+    FragmentMiddleware нечего подставлять.
+    """
+    content = render_to_string(
+        template_name, {'path': PATH_PLACEHOLDER, **year(None)}
+    )
+    return fill(None, content.encode(), ssi=False)
+
+
+def static_page(template_name):
+    """Собранная страница, а без сборки - нарисованная один раз."""
+    page = load(template_name)
+    if page is not None:
+        return page[0]
+    if template_name not in _static_pages:
+        _static_pages[template_name] = render_static(template_name)
+    return _static_pages[template_name]
+
+
+def respond(request, content, digest):
+    if settings.FRAGMENTS_SSI:
+        # Шапку собирает фронтовой сервер, страница общая для всех.
+        etag = f'"{digest}"'
+        cache_control = f'public, max-age={settings.PRERENDER_MAX_AGE}'
+    else:
+        # Шапка персональная: браузер хранит страницу, но сверяет ETag.
+        etag = f'"{digest}-{request.user.pk or 0}"'
+        cache_control = 'private, no-cache'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(content)
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    return response
+
+
+class PrerenderedMixin:
+    """Отдаёт страницу, собранную командой prerender, или рисует её."""
+
+    def get(self, request, *args, **kwargs):
+        page = load(self.template_name)
+        if page is None:
+            return self.render_live(request, *args, **kwargs)
+        return respond(request, *page)
+
+    def render_live(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
@@ -0,0 +1,45 @@
+import math
+import time
+
+from django.core.cache import cache
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+WINDOW_KEY = 'ratelimit:{}:{}'
+
+
+def parse_rate(rate):
+    """'30/h' -> токенов в секунду."""
+    count, _, period = rate.partition('/')
+    return int(count) / PERIODS[period]
+
+
+class FixedWindow:
+    """
+    Ограничение частоты окнами на атомарных счётчиках кеша.
+
+    Окно длится burst / rate секунд, в нём проходит не больше burst
+    запросов; на стыке окон подряд может пройти до двух burst. Счётчик
+    меняется только через add/incr, поэтому одновременные запросы
+    не проскакивают сверх лимита.
+    """
+
+    def __init__(self, burst, rate):
+        self.burst = burst
+        self.window = burst / parse_rate(rate)
+
+    def consume(self, key):
+        """Возвращает (разрешено, секунд до следующего окна)."""
+        now = time.time()
+        index = int(now // self.window)
+        key = f'{key}:{index}'
+        timeout = math.ceil(self.window) + 1
+        cache.add(key, 0, timeout)
+        try:
+            count = cache.incr(key)
+        except ValueError:
+            # Счётчик истёк между add и incr.
+            cache.add(key, 0, timeout)
+            count = cache.incr(key)
+        if count <= self.burst:
+            return True, 0
+        return False, (index + 1) * self.window - now
@@ -0,0 +1,46 @@
+import random
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_state = threading.local()
+
+
+def read_databases():
+    """Базы, которые читает сайт: default, реплики, шарды постов и архив."""
+    aliases = [
+        DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS, *settings.POST_SHARDS
+    ]
+    if settings.ARCHIVE_DATABASE is not None:
+        aliases.append(settings.ARCHIVE_DATABASE)
+    return list(dict.fromkeys(aliases))
+
+
+def use_replica(enabled):
+    _state.replica = enabled
+    _state.wrote = False
+
+
+def wrote():
+    return getattr(_state, 'wrote', False)
+
+
+class ReplicaRouter:
+    """Чтение страниц из DATABASE_REPLICAS, запись - в основную БД."""
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        if getattr(_state, 'replica', False) and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        _state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и основная БД.
+        return True
@@ -0,0 +1,11 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from ..fragments import marker
+
+register = template.Library()
+
+
+@register.simple_tag
+def fragment(name, **kwargs):
+    return mark_safe(marker(name, kwargs))
@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import User
+from ..auth import user_cache_key
+
+ABOUT_URL = reverse('about:author')
+
+
+@override_settings(
+    SHARED_CACHE=True,
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+)
+class CachedAuthTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='user')
+
+    def setUp(self):
+        cache.clear()
+        self.another = Client()
+        self.another.force_login(self.user)
+
+    def test_authenticated_request_without_db(self):
+        """Повторный запрос не читает ни сессию, ни пользователя из БД."""
+        self.another.get(ABOUT_URL)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.another.get(ABOUT_URL)
+        self.assertEqual(response.context['user'], self.user)
+        self.assertEqual(len(captured), 0)
+
+    def test_user_cache_invalidated_on_save(self):
+        """Изменение пользователя сбрасывает его запись в кеше."""
+        self.another.get(ABOUT_URL)
+        self.assertIsNotNone(cache.get(user_cache_key(self.user.pk)))
+        self.user.first_name = 'Новое имя'
+        self.user.save()
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        response = self.another.get(ABOUT_URL)
+        self.assertEqual(response.context['user'].first_name, 'Новое имя')
+
+    @override_settings(SHARED_CACHE=False)
+    def test_local_cache_not_used_for_users(self):
+        """С локальным кешем пользователь читается из БД."""
+        self.another.get(ABOUT_URL)
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
@@ -0,0 +1,63 @@
+import gzip
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TransactionTestCase
+
+from posts.models import Post, User
+
+
+class BackupTest(TransactionTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        user = User.objects.create_user(username='author')
+        Post.objects.bulk_create(
+            Post(author=user, text=f'Пост {index}') for index in range(50)
+        )
+
+    def backup(self, name, **options):
+        path = os.path.join(self.directory, name)
+        output = StringIO()
+        call_command('backup_db', output=path, stdout=output, **options)
+        return path, output.getvalue()
+
+    def test_backup_and_restore(self):
+        """Снимок восстанавливает базу на момент копирования."""
+        path, output = self.backup('db.sqlite3', verify=True)
+        self.assertIn('МБ/с', output)
+        self.assertIn('Целостность: ok', output)
+        Post.objects.all().delete()
+        call_command('restore_db', path, interactive=False, stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 50)
+
+    def test_compressed_backup(self):
+        """С --compress пишется сжатый дамп, из него база восстановима."""
+        text = 'Строка;\n\nещё строка;'
+        Post.objects.create(author=User.objects.get(), text=text)
+        path, output = self.backup('db.sqlite3', compress=True, verify=True)
+        self.assertIn('Целостность: ok', output)
+        self.assertFalse(os.path.exists(path))
+        with gzip.open(path + '.gz', 'rt') as snapshot:
+            self.assertEqual(snapshot.readline(), 'BEGIN TRANSACTION;\n')
+        self.assertEqual(os.listdir(self.directory), ['db.sqlite3.gz'])
+        Post.objects.all().delete()
+        call_command(
+            'restore_db', path + '.gz', interactive=False, stdout=StringIO()
+        )
+        self.assertEqual(Post.objects.count(), 51)
+        self.assertTrue(Post.objects.filter(text=text).exists())
+
+    def test_verify_rejects_damaged_snapshot(self):
+        """Повреждённый снимок не проходит проверку."""
+        path, _ = self.backup('db.sqlite3')
+        with open(path, 'r+b') as snapshot:
+            snapshot.seek(4096)
+            snapshot.write(b'\xff' * 4096)
+        with self.assertRaises(CommandError):
+            call_command(
+                'restore_db', path, verify_only=True, stdout=StringIO()
+            )
@@ -0,0 +1,99 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotFound
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from ..cache import LOCK_KEY, page_key, shared_cache_page
+
+
+@override_settings(PAGE_CACHE_MAX_STALE=60, PAGE_CACHE_POLL_INTERVAL=0.01)
+class StaleWhileRevalidateTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+        self.lock = threading.Lock()
+
+        @shared_cache_page(20)
+        def view(request):
+            with self.lock:
+                self.calls += 1
+                calls = self.calls
+            time.sleep(0.2)
+            return HttpResponse(f'render {calls}')
+
+        self.view = view
+        self.request = RequestFactory().get('/page/')
+
+    def test_concurrent_misses_render_once(self):
+        """Одновременные промахи строят страницу один раз."""
+        results = []
+
+        def fetch():
+            results.append(self.view(self.request).content)
+
+        threads = [threading.Thread(target=fetch) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [b'render 1'] * 8)
+
+    def test_stale_copy_served_while_one_worker_regenerates(self):
+        """Устаревшая копия отдаётся, пока один воркер её обновляет."""
+        self.view(self.request)
+        later = time.time() + 30
+        with mock.patch('core.cache.time.time', return_value=later):
+            regenerating = threading.Thread(
+                target=self.view, args=(self.request,)
+            )
+            regenerating.start()
+            time.sleep(0.05)
+            stale = self.view(self.request).content
+            regenerating.join()
+            fresh = self.view(self.request).content
+        self.assertEqual(stale, b'render 1')
+        self.assertEqual(fresh, b'render 2')
+        self.assertEqual(self.calls, 2)
+
+    @override_settings(PAGE_CACHE_LOCK_TIMEOUT=0.1)
+    def test_stale_copy_bounded(self):
+        """Копия старше предела устаревания не отдаётся."""
+        for max_stale, expected in ((60, b'render 1'), (10, b'render 2')):
+            with self.subTest(max_stale=max_stale):
+                cache.clear()
+                self.calls = 0
+                with override_settings(PAGE_CACHE_MAX_STALE=max_stale):
+                    self.view(self.request)
+                # Страницу как будто уже обновляет другой воркер.
+                cache.add(LOCK_KEY.format(page_key(self.request, ())), 1)
+                later = time.time() + 45
+                with mock.patch('time.time', return_value=later):
+                    content = self.view(self.request).content
+                self.assertEqual(content, expected)
+
+    def test_error_response_not_cached_publicly(self):
+        """Ответ не 200 не получает публичного кеша."""
+        @shared_cache_page(20)
+        def missing(request):
+            return HttpResponseNotFound()
+
+        response = missing(self.request)
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header('Cache-Control'))
+
+    def test_expired_lock_of_another_worker_kept(self):
+        """Воркер не снимает блокировку, перехваченную другим."""
+        lock_key = LOCK_KEY.format(page_key(self.request, ()))
+
+        @shared_cache_page(20)
+        def slow(request):
+            # Своя блокировка истекла, её взял другой воркер.
+            cache.set(lock_key, 'other')
+            return HttpResponse('render')
+
+        slow(self.request)
+        self.assertEqual(cache.get(lock_key), 'other')
@@ -0,0 +1,77 @@
+import gzip
+
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+
+from posts.models import Post, User
+from ..compression import available, negotiate, preferred
+from ..middleware.compression import CompressionMiddleware
+
+INDEX_URL = reverse('posts:index')
+
+
+class CompressionTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='user')
+        Post.objects.create(author=cls.user, text='Тестовый пост ' * 50)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_negotiation_respects_quality(self):
+        """Кодировка выбирается с учётом q-значений."""
+        codings = ('br', 'gzip')
+        self.assertEqual(preferred('gzip;q=0.5, br', codings), 'br')
+        self.assertEqual(preferred('br;q=0.1, gzip;q=1', codings), 'gzip')
+        self.assertEqual(preferred('br;q=0.1, *;q=0.5', codings), 'gzip')
+        self.assertEqual(preferred('gzip, br', codings), 'br')
+        self.assertEqual(negotiate('gzip, deflate'), 'gzip')
+        self.assertIsNone(negotiate('gzip;q=0, deflate'))
+        self.assertIsNone(negotiate(''))
+
+    def test_explicit_refusal_overrides_wildcard(self):
+        """Явное gzip;q=0 сильнее, чем '*'."""
+        self.assertNotEqual(negotiate('gzip;q=0, *'), 'gzip')
+        self.assertIsNone(negotiate('gzip;q=0, br;q=0, *'))
+        self.assertIsNone(negotiate('*;q=0'))
+        self.assertEqual(negotiate('*'), available()[0])
+        self.assertEqual(negotiate('br;q=0, gzip;Q=0.5'), 'gzip')
+
+    def test_page_compressed(self):
+        """HTML-страница сжимается gzip, если клиент его принимает."""
+        plain = Client().get(INDEX_URL)
+        cache.clear()
+        response = Client().get(INDEX_URL, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_streaming_response_compressed(self):
+        """Потоковый ответ сжимается по частям."""
+        chunks = [b'<p>%d</p>' % i * 100 for i in range(5)]
+        middleware = CompressionMiddleware(
+            lambda request: StreamingHttpResponse(iter(chunks))
+        )
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        response = middleware(request)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(
+            gzip.decompress(b''.join(response.streaming_content)),
+            b''.join(chunks)
+        )
+
+    def test_small_and_encoded_responses_skipped(self):
+        """Короткие и уже сжатые ответы не трогаются."""
+        encoded = HttpResponse(b'x' * 1000)
+        encoded['Content-Encoding'] = 'br'
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        for response in (HttpResponse(b'short'), encoded):
+            with self.subTest(response=response):
+                middleware = CompressionMiddleware(lambda request: response)
+                self.assertEqual(
+                    middleware(request).content, response.content
+                )
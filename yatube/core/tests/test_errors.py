@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+
+from ..views import server_error
+
+MISSING_URL = '/missing/<b>/'
+
+
+class ErrorPagesTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = get_user_model().objects.create_user(username='user')
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = self.client_class()
+        self.authorized_client.force_login(self.user)
+
+    def test_404_without_db_and_session(self):
+        """Страница 404 не читает сессию и не ходит в базу."""
+        self.client.get(MISSING_URL)
+        with self.assertNumQueries(0):
+            response = self.authorized_client.get(MISSING_URL)
+        self.assertEqual(response.status_code, 404)
+        self.assertTemplateNotUsed(response, 'core/404.html')
+        self.assertNotIn('Cookie', response.get('Vary', ''))
+        self.assertContains(response, 'Войти', status_code=404)
+        self.assertContains(
+            response, '/missing/&lt;b&gt;/', status_code=404
+        )
+
+    def test_500_page(self):
+        """Страница 500 отдаётся без шаблонов и запросов к базе."""
+        request = RequestFactory().get('/broken/')
+        with self.assertNumQueries(0):
+            response = server_error(request)
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('Ошибка 500', response.content.decode())
+
+    @override_settings(STATIC_ERROR_PAGES=False)
+    def test_live_error_pages(self):
+        """Без STATIC_ERROR_PAGES шаблон рисуется на каждый запрос."""
+        response = self.authorized_client.get(MISSING_URL)
+        self.assertTemplateUsed(response, 'core/404.html')
+        self.assertContains(response, 'Выйти', status_code=404)
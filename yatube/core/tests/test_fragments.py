@@ -0,0 +1,106 @@
+import re
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+from ..fragments import encode
+
+INDEX_URL = reverse('posts:index')
+
+
+class SharedPageFragmentsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.post = Post.objects.create(author=cls.author, text='Тестовый пост')
+        cls.POST_DETAIL_URL = reverse('posts:post_detail', args=[cls.post.pk])
+        cls.ADD_COMMENT_URL = reverse('posts:add_comment', args=[cls.post.pk])
+        cls.EDIT_URL = reverse('posts:post_edit', args=[cls.post.pk])
+
+    def setUp(self):
+        cache.clear()
+        self.guest = Client()
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def test_header_personalised_on_shared_page(self):
+        """Общая копия страницы получает шапку текущего пользователя."""
+        first = self.author_client.get(INDEX_URL).content.decode()
+        second = self.reader_client.get(INDEX_URL)
+        self.assertNotIn('page_obj', second.context)
+        second = second.content.decode()
+        self.assertIn('>author</a>', first)
+        self.assertIn('>reader</a>', second)
+        self.assertNotIn('>author</a>', second)
+        self.assertIn('Войти', self.guest.get(INDEX_URL).content.decode())
+
+    def test_post_detail_fragments(self):
+        """Ссылка на редактирование и форма - только своим."""
+        author_page = self.author_client.get(self.POST_DETAIL_URL)
+        reader_page = self.reader_client.get(self.POST_DETAIL_URL)
+        guest_page = self.guest.get(self.POST_DETAIL_URL)
+        self.assertContains(author_page, self.EDIT_URL)
+        self.assertNotContains(reader_page, self.EDIT_URL)
+        self.assertContains(reader_page, self.ADD_COMMENT_URL)
+        self.assertContains(reader_page, 'csrfmiddlewaretoken')
+        self.assertNotContains(guest_page, self.ADD_COMMENT_URL)
+
+    def test_new_comment_invalidates_cached_page(self):
+        """Новый комментарий сразу виден на закешированной странице."""
+        self.reader_client.get(self.POST_DETAIL_URL)
+        self.reader_client.post(
+            self.ADD_COMMENT_URL, {'text': 'Свежий комментарий'}
+        )
+        self.assertContains(
+            self.guest.get(self.POST_DETAIL_URL), 'Свежий комментарий'
+        )
+
+    @override_settings(FRAGMENTS_SSI=True)
+    def test_ssi_directives_and_fragment_endpoint(self):
+        """В режиме SSI страница ссылается на отдельный фрагмент."""
+        content = self.reader_client.get(INDEX_URL).content.decode()
+        self.assertNotIn('>reader</a>', content)
+        url = re.search(r'<!--# include virtual="([^"]+)" -->', content)[1]
+        response = self.reader_client.get(url)
+        self.assertContains(response, '>reader</a>')
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+
+    def test_fragment_endpoint_rejects_bad_payload(self):
+        """Битые и чужие параметры фрагмента - 400, неизвестный - 404."""
+        url = reverse('fragment', args=['post_edit_link'])
+        payloads = (
+            '!!!',
+            encode([1, 2]),
+            encode({'post_id': self.post.pk}),
+            encode({
+                'post_id': self.post.pk,
+                'author_id': self.author.pk,
+                'extra': 1,
+            }),
+        )
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                response = self.reader_client.get(url, {'p': payload})
+                self.assertEqual(response.status_code, 400)
+        cases = (
+            ('comment_form', {'post_id': 'x/y'}),
+            ('comment_form', {'post_id': -1}),
+            ('post_edit_link', {'post_id': 'x/y', 'author_id': 1}),
+            ('post_edit_link', {'post_id': 1, 'author_id': [1]}),
+        )
+        for name, kwargs in cases:
+            with self.subTest(name=name, kwargs=kwargs):
+                response = self.reader_client.get(
+                    reverse('fragment', args=[name]), {'p': encode(kwargs)}
+                )
+                self.assertEqual(response.status_code, 400)
+        response = self.reader_client.get(
+            reverse('fragment', args=['missing'])
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,112 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post, User
+from ..instrumentation import RequestStats
+from ..middleware.load_shedding import (
+    CLOSED, HALF_OPEN, OPEN, PROBE_KEY, breaker
+)
+
+INDEX_URL = reverse('posts:index')
+FOLLOW_INDEX_URL = reverse('posts:follow_index')
+ABOUT_URL = reverse('about:author')
+LOGIN_URL = reverse('users:login')
+
+
+def slow_stats(milliseconds):
+    stats = RequestStats()
+    stats.db_queries = 1
+    stats.db_time = milliseconds / 1000
+    return stats
+
+
+class LoadSheddingTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='user')
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+        cls.ADD_COMMENT_URL = reverse('posts:add_comment', args=[cls.post.pk])
+        cls.POST_DETAIL_URL = reverse(
+            'posts:post_detail', args=[cls.post.pk]
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.another = Client()
+        self.another.force_login(self.user)
+        self.addCleanup(self.reset_breaker)
+
+    def reset_breaker(self):
+        breaker.state, breaker.latency, breaker.open_until = CLOSED, 0.0, 0.0
+
+    def open_breaker(self):
+        for _ in range(20):
+            breaker.record(slow_stats(1000))
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_slow_database_opens_breaker(self):
+        """Медленные запросы к БД размыкают предохранитель."""
+        breaker.record(slow_stats(1))
+        self.assertEqual(breaker.state, CLOSED)
+        self.open_breaker()
+
+    def test_degraded_mode(self):
+        """Чтение из кеша, тяжёлые страницы и запись - 503."""
+        self.another.get(INDEX_URL)
+        self.open_breaker()
+        with self.assertNumQueries(0):
+            response = self.client.get(INDEX_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Тестовый пост')
+        for response in (
+            self.another.get(FOLLOW_INDEX_URL),
+            self.another.get(self.POST_DETAIL_URL),
+            self.another.post(self.ADD_COMMENT_URL, {'text': 'Комментарий'}),
+        ):
+            with self.subTest(url=response.request['PATH_INFO']):
+                self.assertEqual(response.status_code, 503)
+                self.assertEqual(response['Retry-After'], '30')
+        self.assertFalse(self.post.comments.exists())
+
+    def test_breaker_recovers(self):
+        """После паузы быстрые запросы замыкают предохранитель."""
+        self.open_breaker()
+        with mock.patch(
+            'core.middleware.load_shedding.time.monotonic',
+            return_value=breaker.open_until + 1,
+        ):
+            response = self.another.get(FOLLOW_INDEX_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_db_free_views_not_shed(self):
+        """Страницы без БД и вход работают при разомкнутом предохранителе."""
+        self.open_breaker()
+        self.assertEqual(self.client.get(ABOUT_URL).status_code, 200)
+        response = self.client.post(
+            LOGIN_URL, {'username': 'user', 'password': 'wrong'}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_half_open_admits_single_probe(self):
+        """В полуоткрытом состоянии в БД идёт один пробный запрос."""
+        self.open_breaker()
+        later = breaker.open_until + 1
+        with mock.patch(
+            'core.middleware.load_shedding.time.monotonic',
+            return_value=later,
+        ):
+            self.assertEqual(breaker.current(), HALF_OPEN)
+            # Пробу уже ведёт другой запрос.
+            cache.add(PROBE_KEY, 1)
+            response = self.another.get(FOLLOW_INDEX_URL)
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(breaker.state, HALF_OPEN)
+            cache.delete(PROBE_KEY)
+            response = self.another.get(FOLLOW_INDEX_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(breaker.state, CLOSED)
@@ -0,0 +1,24 @@
+from django.core import mail
+from django.test import TestCase, override_settings
+
+from .. import mail as background_mail
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.BackgroundEmailBackend',
+    BACKGROUND_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    BACKGROUND_EMAIL_WORKERS=1,
+)
+class BackgroundEmailTest(TestCase):
+    def setUp(self):
+        background_mail._executor = None
+
+    def test_messages_sent_in_background(self):
+        """Письмо уходит через фоновый поток настроенным бэкендом."""
+        sent = mail.send_mail(
+            'Тема', 'Текст', 'from@yatube.ru', ['to@yatube.ru']
+        )
+        self.assertEqual(sent, 1)
+        background_mail.get_executor().submit(lambda: None).result()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'Тема')
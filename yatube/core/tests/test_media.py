@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+CONTENT = bytes(range(256)) * 4
+IMAGE_URL = reverse('media', args=['posts/image.png'])
+PRIVATE_URL = reverse('media', args=['private/report.txt'])
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class MediaTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        for name in ('posts/image.png', 'private/report.txt'):
+            path = os.path.join(TEMP_MEDIA_ROOT, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as file:
+                file.write(CONTENT)
+        cls.mtime = os.stat(
+            os.path.join(TEMP_MEDIA_ROOT, 'posts/image.png')
+        ).st_mtime
+        cls.staff = get_user_model().objects.create_user(
+            username='staff', is_staff=True
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def test_full_file(self):
+        """Файл целиком отдаётся с кешированием и Accept-Ranges."""
+        response = self.client.get(IMAGE_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Last-Modified'], http_date(self.mtime))
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_range(self):
+        """Диапазоны байт отдаются ответом 206."""
+        cases = (
+            ('bytes=10-19', CONTENT[10:20], 'bytes 10-19/1024'),
+            ('bytes=1000-', CONTENT[1000:], 'bytes 1000-1023/1024'),
+            ('bytes=-4', CONTENT[-4:], 'bytes 1020-1023/1024'),
+        )
+        for header, body, content_range in cases:
+            with self.subTest(header=header):
+                response = self.client.get(IMAGE_URL, HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(b''.join(response.streaming_content), body)
+                self.assertEqual(response['Content-Range'], content_range)
+                self.assertEqual(response['Content-Length'], str(len(body)))
+
+    def test_unsatisfiable_range(self):
+        """Диапазон за концом файла - 416."""
+        response = self.client.get(IMAGE_URL, HTTP_RANGE='bytes=2000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_not_modified(self):
+        """If-Modified-Since без изменений файла - 304."""
+        response = self.client.get(
+            IMAGE_URL, HTTP_IF_MODIFIED_SINCE=http_date(self.mtime)
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_private_files_for_staff_only(self):
+        """Файлы вне публичных каталогов доступны только персоналу."""
+        self.assertEqual(self.client.get(PRIVATE_URL).status_code, 403)
+        staff = Client()
+        staff.force_login(self.staff)
+        response = staff.get(PRIVATE_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_traversal_into_private_files(self):
+        """Путь через публичный каталог не открывает закрытые файлы."""
+        url = reverse('media', args=['posts/../private/report.txt'])
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_missing_and_outside_files(self):
+        """Несуществующие файлы и выход за MEDIA_ROOT - 404."""
+        for name in ('posts/missing.png', 'posts/../../settings.py'):
+            with self.subTest(name=name):
+                response = self.client.get(settings.MEDIA_URL + name)
+                self.assertEqual(response.status_code, 404)
+
+    def test_front_server_handoff(self):
+        """С MEDIA_ACCEL файл отправляет фронтовой сервер."""
+        with self.settings(MEDIA_ACCEL='nginx'):
+            response = self.client.get(IMAGE_URL)
+            self.assertEqual(
+                response['X-Accel-Redirect'],
+                '/protected-media/posts/image.png',
+            )
+        with self.settings(MEDIA_ACCEL='sendfile'):
+            response = self.client.get(IMAGE_URL)
+            self.assertEqual(
+                response['X-Sendfile'],
+                os.path.join(TEMP_MEDIA_ROOT, 'posts/image.png'),
+            )
+        self.assertEqual(response.content, b'')
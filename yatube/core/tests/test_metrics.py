@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+from .. import instrumentation
+from ..metrics import registry
+
+METRICS_URL = reverse('metrics')
+INDEX_URL = reverse('posts:index')
+
+
+class MetricsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='user')
+        cls.staff = User.objects.create_user(username='staff', is_staff=True)
+        Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def setUp(self):
+        registry.views.clear()
+        cache.clear()
+        self.another = Client()
+        self.another.force_login(self.user)
+        self.admin = Client()
+        self.admin.force_login(self.staff)
+
+    def test_metrics_only_for_staff(self):
+        """Метрики доступны только персоналу."""
+        self.assertEqual(Client().get(METRICS_URL).status_code, 403)
+        self.assertEqual(self.another.get(METRICS_URL).status_code, 403)
+        self.assertEqual(self.admin.get(METRICS_URL).status_code, 200)
+
+    def test_metrics_count_view_requests(self):
+        """Запросы к страницам учитываются по имени URL."""
+        self.another.get(INDEX_URL)
+        self.another.get(INDEX_URL)
+        row = registry.views['posts:index']
+        self.assertEqual(row['statuses'], {'200': 2})
+        self.assertGreater(row['db_queries_total'], 0)
+        self.assertGreater(row['cache_hits_total'], 0)
+        self.assertGreater(row['template_render_seconds_total'], 0)
+        body = self.admin.get(METRICS_URL).content.decode()
+        self.assertIn(
+            'yatube_requests_total{view="posts:index",status="200"} 2', body
+        )
+        self.assertIn(
+            'yatube_request_duration_seconds_count{view="posts:index"} 2',
+            body
+        )
+
+    def test_get_many_counted_once(self):
+        """get_many не считает ключи повторно через вложенный get."""
+        instrumentation.install()
+        cache.set('present', 1)
+        with instrumentation.collect() as stats:
+            cache.get_many(['present', 'missing'])
+        self.assertEqual((stats.cache_hits, stats.cache_misses), (1, 1))
+
+    def test_metrics_merge_workers(self):
+        """Метрики воркеров сводятся через общий каталог."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        with override_settings(METRICS_DIR=directory):
+            self.another.get(INDEX_URL)
+            registry.maybe_flush(force=True)
+            shutil.copy(
+                os.path.join(directory, f'metrics-{os.getpid()}.json'),
+                os.path.join(directory, 'metrics-0.json'),
+            )
+            views = registry.collect()
+        self.assertEqual(views['posts:index']['statuses'], {'200': 2})
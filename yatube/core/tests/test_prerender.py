@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+AUTHOR_URL = reverse('about:author')
+TECH_URL = reverse('about:tech')
+
+
+class PrerenderTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = get_user_model().objects.create_user(username='user')
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        settings = override_settings(PRERENDER_ROOT=self.root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.authorized = Client()
+        self.authorized.force_login(self.user)
+
+    def prerender(self):
+        call_command('prerender', stdout=StringIO())
+
+    def test_live_rendering_without_build(self):
+        """Без сборки страницы рисуются на лету."""
+        response = self.client.get(AUTHOR_URL)
+        self.assertTemplateUsed(response, 'about/author.html')
+        self.assertNotIn('ETag', response)
+
+    def test_prerendered_pages_are_served(self):
+        """Собранная страница отдаётся из файла."""
+        self.prerender()
+        path = os.path.join(self.root, 'about', 'tech.html')
+        with open(path, 'a') as page:
+            page.write('<!-- собрано -->')
+        response = self.client.get(TECH_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateNotUsed(response, 'about/tech.html')
+        self.assertContains(response, '<!-- собрано -->')
+        self.assertContains(response, 'Войти')
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+
+    def test_personal_header_and_etag(self):
+        """Шапка подставляется для пользователя, ETag у каждого свой."""
+        self.prerender()
+        anonymous = self.client.get(AUTHOR_URL)
+        response = self.authorized.get(AUTHOR_URL)
+        self.assertContains(response, 'Выйти')
+        self.assertNotEqual(response['ETag'], anonymous['ETag'])
+        cached = self.authorized.get(
+            AUTHOR_URL, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(cached.status_code, 304)
+
+    @override_settings(FRAGMENTS_SSI=True)
+    def test_ssi_pages_are_public(self):
+        """С SSI страница общая и кешируется надолго."""
+        self.prerender()
+        response = self.authorized.get(AUTHOR_URL)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=86400')
+        self.assertEqual(response['ETag'], self.client.get(AUTHOR_URL)['ETag'])
+
+    def test_prerendered_404(self):
+        """Страница 404 берётся из сборки с экранированным адресом."""
+        self.prerender()
+        response = self.client.get('/missing/<b>/')
+        self.assertEqual(response.status_code, 404)
+        self.assertTemplateNotUsed(response, 'core/404.html')
+        self.assertContains(
+            response, '/missing/&lt;b&gt;/', status_code=404
+        )
@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+PROFILE_URL = reverse('posts:index') + '?_profile=1&_sort=tottime&_limit=5'
+
+
+class ProfilerTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='user')
+        cls.staff = User.objects.create_user(username='staff', is_staff=True)
+        Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+        self.another = Client()
+        self.another.force_login(self.user)
+        self.admin = Client()
+        self.admin.force_login(self.staff)
+
+    def test_profiler_disabled_by_default(self):
+        """Без настройки параметр _profile игнорируется."""
+        response = self.admin.get(PROFILE_URL)
+        self.assertTemplateUsed(response, 'posts/index.html')
+
+    @override_settings(PROFILER_ENABLED=True)
+    def test_profiler_only_for_staff(self):
+        """Обычный пользователь получает страницу, персонал - отчёт."""
+        response = self.another.get(PROFILE_URL)
+        self.assertTemplateUsed(response, 'posts/index.html')
+        cache.clear()
+        response = self.admin.get(PROFILE_URL)
+        self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+        report = response.content.decode()
+        self.assertIn('function calls', report)
+        self.assertIn('SQL (default)', report)
+        self.assertIn('posts_post', report)
+
+
+@override_settings(PROFILER_ENABLED=True, POST_SHARDS=['shard_0', 'shard_1'])
+class ShardedProfilerTest(TestCase):
+    databases = {'default', 'shard_0', 'shard_1'}
+
+    def test_shard_queries_reported(self):
+        """В отчёт попадают запросы к шардам постов."""
+        user = User.objects.create_user(username='user')
+        Post.objects.create(author=user, text='Тестовый пост')
+        staff = User.objects.create_user(username='staff', is_staff=True)
+        client = Client()
+        client.force_login(staff)
+        cache.clear()
+        report = client.get(PROFILE_URL).content.decode()
+        self.assertIn('SQL (shard_0)', report)
+        self.assertIn('SQL (shard_1)', report)
@@ -0,0 +1,93 @@
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+from ..ratelimit import FixedWindow
+
+
+class FixedWindowTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = 1000.0
+        patcher = mock.patch(
+            'core.ratelimit.time.time', side_effect=lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.limiter = FixedWindow(burst=3, rate='60/m')
+
+    def test_burst(self):
+        """Подряд проходит burst запросов, следующий ждёт нового окна."""
+        results = [self.limiter.consume('key')[0] for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+        # Окно длиной 3 с началось в 999 с.
+        self.assertAlmostEqual(self.limiter.consume('key')[1], 2)
+
+    def test_sustained_rate(self):
+        """При равномерной нагрузке проходит не больше rate."""
+        for _ in range(3):
+            self.limiter.consume('key')
+        allowed = 0
+        for _ in range(100):
+            self.now += 0.5
+            allowed += self.limiter.consume('key')[0]
+        self.assertLessEqual(allowed, 50)
+        self.assertGreaterEqual(allowed, 50 - 3)
+
+    def test_concurrent_requests_limited(self):
+        """Одновременные запросы не проходят сверх burst."""
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.limiter.consume('key')[0]
+                )
+            )
+            for _ in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sum(results), 3)
+
+    def test_keys_independent(self):
+        """У каждого ключа свой счётчик."""
+        for _ in range(3):
+            self.limiter.consume('first')
+        self.assertFalse(self.limiter.consume('first')[0])
+        self.assertTrue(self.limiter.consume('second')[0])
+
+
+@override_settings(RATE_LIMITS={
+    'posts:add_comment': {'burst': 2, 'rate': '1/h', 'key': 'user'},
+})
+class RateLimitMiddlewareTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='user')
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+        cls.ADD_COMMENT_URL = reverse('posts:add_comment', args=[cls.post.pk])
+
+    def setUp(self):
+        cache.clear()
+        self.another = Client()
+        self.another.force_login(self.user)
+
+    def test_comments_limited(self):
+        """Сверх лимита комментарии отклоняются с кодом 429."""
+        statuses = [
+            self.another.post(
+                self.ADD_COMMENT_URL, {'text': 'Комментарий'}
+            ).status_code
+            for _ in range(3)
+        ]
+        self.assertEqual(statuses, [302, 302, 429])
+        self.assertEqual(self.post.comments.count(), 2)
+        response = self.another.post(self.ADD_COMMENT_URL, {'text': 'Ещё'})
+        self.assertGreater(int(response['Retry-After']), 3000)
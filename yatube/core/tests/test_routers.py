@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+POST_CREATE_URL = reverse('posts:post_create')
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRouterTest(TestCase):
+    databases = {'default', 'replica'}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='user')
+        # Реплика отстаёт: пользователь уже есть, поста ещё нет.
+        User.objects.using('replica').create(
+            pk=cls.user.pk, username=cls.user.username
+        )
+        Post.objects.create(author=cls.user, text='Пост из основной БД')
+        cls.PROFILE_URL = reverse('posts:profile', args=[cls.user.username])
+
+    def setUp(self):
+        cache.clear()
+        self.author = Client()
+        self.author.force_login(self.user)
+
+    def test_read_views_use_replica(self):
+        """Страницы для чтения берут данные из реплики."""
+        response = self.client.get(self.PROFILE_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'Пост из основной БД')
+
+    def test_author_reads_own_writes(self):
+        """После записи автор читает из основной БД."""
+        response = self.author.post(
+            POST_CREATE_URL, {'text': 'Новый пост'}, follow=True
+        )
+        self.assertRedirects(response, self.PROFILE_URL)
+        self.assertContains(response, 'Новый пост')
+        self.assertNotContains(self.client.get(self.PROFILE_URL), 'Новый пост')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        """Без реплик всё читается из основной БД."""
+        self.assertContains(
+            self.client.get(self.PROFILE_URL), 'Пост из основной БД'
+        )
@@ -0,0 +1,39 @@
+import json
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+PROFILE_URL = reverse('posts:profile', args=['user'])
+
+
+class ServerTimingTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='user')
+        Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_header_absent_by_default(self):
+        """Без настройки заголовок Server-Timing не выставляется."""
+        response = Client().get(PROFILE_URL)
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    @override_settings(SERVER_TIMING=True)
+    def test_header_and_log_line(self):
+        """Заголовок и строка лога содержат разбивку по фазам."""
+        with self.assertLogs('core.middleware.server_timing') as logs:
+            response = Client().get(PROFILE_URL)
+        header = response['Server-Timing']
+        for phase in ('db;', 'cache;', 'tpl;', 'thumb;', 'total;'):
+            with self.subTest(phase=phase):
+                self.assertIn(phase, header)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'posts:profile')
+        self.assertGreater(record['db_queries'], 0)
+        self.assertGreater(record['tpl_ms'], 0)
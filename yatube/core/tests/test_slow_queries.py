@@ -0,0 +1,45 @@
+import json
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+INDEX_URL = reverse('posts:index')
+LOGGER = 'core.middleware.slow_queries'
+
+
+class SlowQueryLogTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='user')
+        Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(SLOW_QUERY_THRESHOLD=0, SLOW_QUERY_SAMPLE_RATE=1)
+    def test_slow_query_logged_with_plan(self):
+        """Медленный запрос логируется с планом, страницей и стеком."""
+        with self.assertLogs(LOGGER, 'WARNING') as logs:
+            Client().get(INDEX_URL)
+        records = [json.loads(record.getMessage()) for record in logs.records]
+        self.assertTrue(all(
+            record['view'] == 'posts:index' for record in records
+        ))
+        explained = [record for record in records if record['plan']]
+        self.assertTrue(explained)
+        self.assertLessEqual(len(explained), 3)
+        self.assertTrue(any(
+            'posts/views.py' in line
+            for record in records for line in record['stack']
+        ))
+
+    @override_settings(SLOW_QUERY_THRESHOLD=0, SLOW_QUERY_SAMPLE_RATE=0)
+    def test_unsampled_requests_not_logged(self):
+        """Запросы вне выборки не замеряются."""
+        with self.assertRaises(AssertionError):
+            with self.assertLogs(LOGGER, 'WARNING'):
+                Client().get(INDEX_URL)
@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+
+STATIC_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(STATIC_ROOT=STATIC_ROOT, SERVE_STATIC=True)
+class CompressedStaticTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        call_command(
+            'collectstatic', interactive=False, verbosity=0,
+            ignore_patterns=['admin']
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(STATIC_ROOT, ignore_errors=True)
+
+    def test_collectstatic_hashes_and_compresses(self):
+        """collectstatic создаёт имена с хешем и сжатые копии."""
+        hashed = staticfiles_storage.stored_name('css/pillar-2.css')
+        self.assertRegex(hashed, r'^css/pillar-2\.[0-9a-f]{12}\.css$')
+        self.assertTrue(os.path.isfile(
+            os.path.join(STATIC_ROOT, hashed + '.gz')
+        ))
+        self.assertFalse(os.path.isfile(
+            os.path.join(STATIC_ROOT, 'img/logo.png.gz')
+        ))
+
+    def test_hashed_file_served_compressed_and_immutable(self):
+        """Хешированный файл отдаётся сжатым с бессрочным кешем."""
+        url = staticfiles_storage.url('css/pillar-2.css')
+        response = Client().get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        response.close()
+
+    def test_refused_encoding_not_served(self):
+        """Кодировка с q=0 не отдаётся, даже если упомянута."""
+        url = staticfiles_storage.url('css/pillar-2.css')
+        response = Client().get(url, HTTP_ACCEPT_ENCODING='gzip;q=0, br;q=0')
+        self.assertNotIn('Content-Encoding', response)
+        response.close()
+
+    def test_wildcard_encoding_served(self):
+        """'*' в Accept-Encoding разрешает сжатую копию."""
+        url = staticfiles_storage.url('css/pillar-2.css')
+        response = Client().get(url, HTTP_ACCEPT_ENCODING='br;q=0, *')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        response.close()
+
+    def test_path_outside_root_falls_through(self):
+        """Выход за STATIC_ROOT не обрабатывается middleware."""
+        response = Client().get('/static/../manage.py')
+        self.assertEqual(response.status_code, 404)
+
+    def test_missing_manifest_entry_falls_back_to_name(self):
+        """Файл не из манифеста отдаётся по исходному имени."""
+        self.assertEqual(
+            staticfiles_storage.url('js/missing.js'), '/static/js/missing.js'
+        )
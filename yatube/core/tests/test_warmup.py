@@ -0,0 +1,21 @@
+import gc
+
+from django.test import TestCase
+from django.urls import get_resolver
+from django.utils.functional import empty
+
+from ..warmup import warm_up
+
+
+class WarmUpTest(TestCase):
+    def tearDown(self):
+        gc.unfreeze()
+
+    def test_warm_up_primes_lazy_structures(self):
+        """Прогрев заполняет резолвер URL и бэкенды sorl."""
+        from sorl.thumbnail import default
+
+        warm_up()
+        self.assertTrue(get_resolver()._populated)
+        self.assertIsNot(default.backend._wrapped, empty)
+        self.assertIsNot(default.kvstore._wrapped, empty)
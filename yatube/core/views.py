@@ -1,8 +1,31 @@
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse, HttpResponseBadRequest
 from django.shortcuts import render
+from django.utils.html import escape
+
+from . import fragments, prerender
+from .metrics import registry, render_prometheus
+
+
+def error_page(request, template_name, status):
+    # Без контекст-процессоров и сессии: ошибки дёргают боты, а при
+    # ошибке 500 база может быть недоступна.
+    if not settings.STATIC_ERROR_PAGES:
+        return render(
+            request, template_name, {'path': request.path}, status=status
+        )
+    return HttpResponse(prerender.static_page(template_name).replace(
+        prerender.PATH_PLACEHOLDER.encode(), escape(request.path).encode()
+    ), status=status)
 
 
 def page_not_found(request, exception):
-    return render(request, 'core/404.html', {'path': request.path}, status=404)
+    return error_page(request, 'core/404.html', 404)
+
+
+def permission_denied(request, exception):
+    return error_page(request, 'core/403.html', 403)
 
 
 def csrf_failure(request, reason=''):
@@ -10,4 +33,26 @@ def csrf_failure(request, reason=''):
 
 
 def server_error(request):
-    return render(request, 'core/500.html', status=500)
+    return error_page(request, 'core/500.html', 500)
+
+
+def metrics(request):
+    if not request.user.is_staff:
+        raise PermissionDenied
+    return HttpResponse(
+        render_prometheus(registry.collect()),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
+def fragment(request, name):
+    if name not in fragments.registry:
+        raise Http404
+    try:
+        response = HttpResponse(fragments.render_fragment(
+            request, name, fragments.decode(request.GET.get('p', ''))
+        ))
+    except fragments.BadFragment:
+        return HttpResponseBadRequest()
+    response['Cache-Control'] = 'private, no-cache'
+    return response
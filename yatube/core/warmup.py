@@ -0,0 +1,83 @@
+import gc
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.template.loader import get_template
+from django.urls import URLResolver, get_resolver
+from django.utils import formats, translation
+
+logger = logging.getLogger(__name__)
+
+
+def compile_patterns(resolver):
+    for pattern in resolver.url_patterns:
+        pattern.pattern.regex
+        if isinstance(pattern, URLResolver):
+            compile_patterns(pattern)
+
+
+def warm_urls():
+    resolver = get_resolver()
+    resolver.resolve('/')
+    # Словари для reverse() и {% url %} строятся при первом обращении.
+    resolver.reverse_dict
+    resolver.namespace_dict
+    compile_patterns(resolver)
+
+
+def warm_templates():
+    count = 0
+    for engine in engines.all():
+        for directory in engine.template_dirs:
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    if not name.endswith(('.html', '.txt')):
+                        continue
+                    try:
+                        get_template(os.path.relpath(
+                            os.path.join(root, name), directory
+                        ))
+                    except TemplateSyntaxError:
+                        # Фрагменты, которые не разбираются сами по себе.
+                        continue
+                    count += 1
+    return count
+
+
+def warm_translations():
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext('Russian')
+        for name in ('DATE_FORMAT', 'DATETIME_FORMAT', 'DATE_INPUT_FORMATS'):
+            formats.get_format(name)
+
+
+def warm_thumbnails():
+    from sorl.thumbnail import default
+
+    for lazy in (default.backend, default.kvstore, default.engine,
+                 default.storage):
+        lazy._setup()
+
+
+def warm_up():
+    """Прогревает ленивые структуры до fork воркеров."""
+    started = time.perf_counter()
+    warm_urls()
+    templates = warm_templates()
+    warm_translations()
+    warm_thumbnails()
+    # Соединения с БД нельзя делить между процессами после fork.
+    connections.close_all()
+    gc.collect()
+    if hasattr(gc, 'freeze'):
+        # Прогретые объекты уходят из-под сборщика мусора, и его
+        # проходы не копируют разделяемые страницы памяти.
+        gc.freeze()
+    logger.info(
+        'Прогрев за %.1f мс, шаблонов: %d',
+        (time.perf_counter() - started) * 1000, templates
+    )
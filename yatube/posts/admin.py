@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import Post, Group
+from .deletion import schedule
+from .models import Deletion, Post, Group
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -11,5 +12,31 @@ class PostAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
+class GroupAdmin(admin.ModelAdmin):
+    actions = ('schedule_deletion',)
+
+    def schedule_deletion(self, request, queryset):
+        for group in queryset:
+            schedule(group)
+        self.message_user(
+            request, 'Группы поставлены в очередь на удаление.'
+        )
+    schedule_deletion.short_description = 'Удалить в фоне'
+
+
+class DeletionAdmin(admin.ModelAdmin):
+    list_display = (
+        'target', 'object_id', 'processed', 'total', 'created', 'finished',
+    )
+    list_filter = ('target', 'finished')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 admin.site.register(Post, PostAdmin)
-admin.site.register(Group)
+admin.site.register(Group, GroupAdmin)
+admin.site.register(Deletion, DeletionAdmin)
@@ -0,0 +1,93 @@
+import datetime as dt
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.http import Http404
+from django.utils import timezone
+
+from .models import Comment, Post
+from .sharding import MergedPosts, on_shard
+
+AUTO_DATE_FIELDS = (
+    Post._meta.get_field('pub_date'),
+    Comment._meta.get_field('created'),
+)
+
+
+@contextmanager
+def keep_auto_dates():
+    """Сохраняет заданные вручную даты постов и комментариев."""
+    for field in AUTO_DATE_FIELDS:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in AUTO_DATE_FIELDS:
+            field.auto_now_add = True
+
+
+def hot_databases():
+    return settings.POST_SHARDS or [DEFAULT_DB_ALIAS]
+
+
+def get_post(post_id):
+    """Пост из горячей таблицы, а если его там нет - из архива."""
+    try:
+        return on_shard(Post.objects, post_id).get(pk=post_id)
+    except Post.DoesNotExist:
+        if settings.ARCHIVE_DATABASE is None:
+            raise Http404('Пост не найден.')
+    try:
+        return Post.objects.using(settings.ARCHIVE_DATABASE).get(pk=post_id)
+    except Post.DoesNotExist:
+        raise Http404('Пост не найден.')
+
+
+def is_archived(post):
+    return post._state.db == settings.ARCHIVE_DATABASE
+
+
+def with_archive(queryset):
+    """Добавляет к горячим постам архивные, слитые по дате."""
+    if settings.ARCHIVE_DATABASE is None:
+        return queryset
+    return MergedPosts([
+        queryset, queryset.using(settings.ARCHIVE_DATABASE)
+    ])
+
+
+def archive_batch(alias, post_ids):
+    archive = settings.ARCHIVE_DATABASE
+    posts = list(Post.objects.using(alias).filter(pk__in=post_ids))
+    post_ids = [post.pk for post in posts]
+    comments = list(Comment.objects.using(alias).filter(post__in=post_ids))
+    for comment in comments:
+        # id комментариев на шардах пересекаются, архив выдаёт свои.
+        comment.pk = None
+    with transaction.atomic(using=archive), keep_auto_dates():
+        # Повторный запуск после сбоя не плодит дубликаты.
+        Post.objects.using(archive).bulk_create(posts, ignore_conflicts=True)
+        Comment.objects.using(archive).filter(post__in=post_ids).delete()
+        Comment.objects.using(archive).bulk_create(comments)
+    with transaction.atomic(using=alias):
+        Post.objects.using(alias).filter(pk__in=post_ids).delete()
+    return len(posts), len(comments)
+
+
+def archive_posts(days=None, batch_size=None):
+    """Переносит старые посты с комментариями в ARCHIVE_DATABASE."""
+    days = settings.ARCHIVE_AFTER_DAYS if days is None else days
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    before = timezone.now() - dt.timedelta(days=days)
+    for alias in hot_databases():
+        while True:
+            post_ids = list(
+                Post.objects.using(alias)
+                .filter(pub_date__lt=before)
+                .order_by('pub_date')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not post_ids:
+                break
+            yield alias, archive_batch(alias, post_ids)
@@ -0,0 +1,144 @@
+import time
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from sorl.thumbnail import delete as delete_image
+
+from core.cache import bump_generation
+from .archive import hot_databases
+from .models import Comment, Deletion, Follow, Group, Post, User
+
+TARGET_MODELS = {
+    Deletion.USER: User,
+    Deletion.GROUP: Group,
+}
+
+
+def post_databases():
+    aliases = hot_databases()
+    if settings.ARCHIVE_DATABASE is not None:
+        aliases = [*aliases, settings.ARCHIVE_DATABASE]
+    return aliases
+
+
+def batch_pks(queryset, size):
+    return list(queryset.order_by().values_list('pk', flat=True)[:size])
+
+
+def delete_batch(queryset, size):
+    pks = batch_pks(queryset, size)
+    if pks:
+        queryset.model._base_manager.using(queryset.db).filter(
+            pk__in=pks
+        ).delete()
+    return len(pks)
+
+
+def delete_posts_batch(queryset, size):
+    pks = batch_pks(queryset, size)
+    batch = Post._base_manager.using(queryset.db).filter(pk__in=pks)
+    images = list(
+        batch.exclude(image='').values_list('image', flat=True)
+    )
+    batch.delete()
+    for name in images:
+        # Вместе с файлом удаляются миниатюры sorl и их записи в kvstore.
+        delete_image(name)
+    return len(pks)
+
+
+def ungroup_batch(queryset, size):
+    pks = batch_pks(queryset, size)
+    if pks:
+        Post._base_manager.using(queryset.db).filter(
+            pk__in=pks
+        ).update(group=None)
+        # update() не шлёт сигналы, страницы сбрасываются вручную.
+        bump_generation(Post)
+    return len(pks)
+
+
+def steps(deletion):
+    """Пары (обработчик пачки, запрос) в порядке выполнения."""
+    object_id = deletion.object_id
+    if deletion.target == Deletion.GROUP:
+        for alias in post_databases():
+            yield ungroup_batch, Post.objects.using(alias).filter(
+                group_id=object_id
+            )
+        return
+    yield delete_batch, Follow.objects.filter(
+        Q(user_id=object_id) | Q(author_id=object_id)
+    )
+    for alias in post_databases():
+        yield delete_batch, Comment.objects.using(alias).filter(
+            author_id=object_id
+        )
+        # Чужие комментарии к постам тоже пачками, иначе их одним
+        # запросом удалил бы каскад при удалении постов.
+        yield delete_batch, Comment.objects.using(alias).filter(
+            post__author_id=object_id
+        )
+        yield delete_posts_batch, Post.objects.using(alias).filter(
+            author_id=object_id
+        )
+
+
+def schedule(obj):
+    """Помечает пользователя или группу на удаление в фоне."""
+    target = Deletion.USER if isinstance(obj, User) else Deletion.GROUP
+    if target == Deletion.USER and obj.is_active:
+        # Пока идёт удаление, войти под пользователем уже нельзя.
+        obj.is_active = False
+        obj.save(update_fields=['is_active'])
+    deletion, _ = Deletion.objects.get_or_create(
+        target=target, object_id=obj.pk
+    )
+    if target == Deletion.GROUP:
+        # Группа сразу пропадает из закешированных страниц.
+        bump_generation(Group)
+    deletion.total = deletion.processed + sum(
+        queryset.count() for _, queryset in steps(deletion)
+    )
+    deletion.save(update_fields=['total'])
+    return deletion
+
+
+def run(deletion, batch_size=None, pause=None, progress=None):
+    """
+    Удаляет зависимые строки пачками, а затем сам объект.
+
+    Каждая пачка - отдельная короткая транзакция, между пачками
+    другие запросы успевают получить блокировку SQLite. Прерванное
+    удаление продолжается с того же места при следующем запуске.
+    """
+    batch_size = batch_size or settings.DELETION_BATCH_SIZE
+    pause = settings.DELETION_PAUSE if pause is None else pause
+    for handler, queryset in steps(deletion):
+        while True:
+            done = handler(queryset, batch_size)
+            if not done:
+                break
+            deletion.processed += done
+            deletion.save(update_fields=['processed'])
+            if progress is not None:
+                progress(deletion)
+            time.sleep(pause)
+    TARGET_MODELS[deletion.target]._base_manager.filter(
+        pk=deletion.object_id
+    ).delete()
+    deletion.finished = timezone.now()
+    deletion.save(update_fields=['finished'])
+    return deletion
+
+
+def pending():
+    return Deletion.objects.filter(finished__isnull=True)
+
+
+def visible_groups():
+    """Группы без незавершённого удаления."""
+    return Group.objects.exclude(pk__in=pending().filter(
+        target=Deletion.GROUP
+    ).values('object_id'))
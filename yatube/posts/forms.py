@@ -1,5 +1,6 @@
 from django.forms import ModelForm
 
+from .deletion import visible_groups
 from .models import Post, Comment
 
 
@@ -8,6 +9,10 @@ class PostForm(ModelForm):
         fields = ('text', 'group', 'image',)
         model = Post
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['group'].queryset = visible_groups()
+
 
 class CommentForm(ModelForm):
     class Meta:
@@ -0,0 +1,21 @@
+from django.template.loader import render_to_string
+
+from core.fragments import object_id, register
+from .forms import CommentForm
+
+
+@register('post_edit_link', post_id=object_id, author_id=object_id)
+def post_edit_link(request, post_id, author_id):
+    return render_to_string('posts/includes/post_edit_link.html', {
+        'post_id': post_id,
+        'is_author': request.user.is_authenticated
+        and request.user.pk == author_id,
+    }, request)
+
+
+@register('comment_form', post_id=object_id)
+def comment_form(request, post_id):
+    return render_to_string('posts/includes/comment_form.html', {
+        'post_id': post_id,
+        'form': CommentForm(),
+    }, request)
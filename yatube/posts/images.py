@@ -0,0 +1,19 @@
+from PIL import Image
+
+PLACEHOLDER_FORMAT = '#{:02x}{:02x}{:02x}'
+
+
+def placeholder_color(file):
+    """Средний цвет картинки для заглушки, '' для битого файла."""
+    try:
+        file.seek(0)
+        with Image.open(file) as image:
+            # JPEG декодируется сразу в уменьшенном виде.
+            image.draft('RGB', (64, 64))
+            color = image.convert('RGB').resize((1, 1), Image.BOX)
+            placeholder = PLACEHOLDER_FORMAT.format(*color.getpixel((0, 0)))
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return ''
+    finally:
+        file.seek(0)
+    return placeholder
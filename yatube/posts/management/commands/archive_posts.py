@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...archive import archive_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит посты старше ARCHIVE_AFTER_DAYS вместе с комментариями '
+        'в ARCHIVE_DATABASE, чтобы горячая таблица и её индексы '
+        'оставались маленькими.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None)
+        parser.add_argument('--batch-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        if settings.ARCHIVE_DATABASE is None:
+            raise CommandError('ARCHIVE_DATABASE не задан.')
+        posts = comments = 0
+        for alias, (batch_posts, batch_comments) in archive_posts(
+            options['days'], options['batch_size']
+        ):
+            posts += batch_posts
+            comments += batch_comments
+            self.stdout.write(
+                f'{alias}: перенесено постов {posts}, комментариев {comments}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово: постов {posts}, комментариев {comments}.'
+        ))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from ...deletion import post_databases
+from ...images import placeholder_color
+from ...models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет цвет заглушки у картинок постов, '
+        'загруженных до появления этого поля.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        for alias in post_databases():
+            filled = missing = 0
+            batch = []
+            posts = Post.objects.using(alias).filter(
+                image_placeholder=''
+            ).exclude(image='').only('image').order_by()
+            for post in posts.iterator():
+                try:
+                    with post.image.open('rb') as file:
+                        post.image_placeholder = placeholder_color(file)
+                except OSError:
+                    missing += 1
+                    continue
+                batch.append(post)
+                if len(batch) >= options['batch_size']:
+                    filled += self.save(alias, batch)
+                    batch = []
+            filled += self.save(alias, batch)
+            self.stdout.write(
+                f'{alias}: заполнено {filled}, файлов не найдено {missing}'
+            )
+
+    def save(self, alias, batch):
+        # bulk_update не вызывает save() и сигналы: кеш страниц не нужно
+        # сбрасывать, заглушка видна только до загрузки картинки.
+        Post.objects.using(alias).bulk_update(batch, ['image_placeholder'])
+        return len(batch)
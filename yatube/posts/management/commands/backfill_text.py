@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from ...deletion import post_databases
+from ...models import Post
+from ...text import render_text
+
+FIELDS = ('text_html', 'excerpt', 'excerpt_truncated')
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет HTML текста и выдержку у постов, '
+        'сохранённых до появления этих полей.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--all', action='store_true',
+                            help='Пересобрать и уже заполненные посты.')
+
+    def handle(self, *args, **options):
+        for alias in post_databases():
+            filled = 0
+            batch = []
+            posts = Post.objects.using(alias).only('text').order_by()
+            if not options['all']:
+                posts = posts.filter(
+                    Q(text_html='') | Q(excerpt_truncated__isnull=True)
+                )
+            for post in posts.iterator():
+                post.text_html, post.excerpt, post.excerpt_truncated = (
+                    render_text(post.text)
+                )
+                batch.append(post)
+                if len(batch) >= options['batch_size']:
+                    filled += self.save(alias, batch)
+                    batch = []
+            filled += self.save(alias, batch)
+            self.stdout.write(f'{alias}: заполнено {filled}')
+
+    def save(self, alias, batch):
+        Post.objects.using(alias).bulk_update(batch, FIELDS)
+        return len(batch)
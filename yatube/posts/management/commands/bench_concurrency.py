@@ -0,0 +1,100 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from .bench_views import PERCENTILES, git_revision, percentile
+
+
+def parse_target(value):
+    path, _, weight = value.partition('=')
+    try:
+        return path, float(weight or 1)
+    except ValueError:
+        raise CommandError(f'Неверный вес в {value!r}, ожидается PATH=ВЕС')
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает запущенный сервер смесью медленных и быстрых запросов '
+        'и считает пропускную способность. Запускается отдельно для '
+        'каждого варианта развёртывания, отчёты сравниваются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument(
+            '--target', action='append', type=parse_target, default=None,
+            help='Путь и доля запросов, например /about/tech/=9.'
+        )
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--timeout', type=float, default=30)
+        parser.add_argument('--label', default='wsgi')
+        parser.add_argument('--output', default=None)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        targets = options['target'] or [('/', 9), ('/follow/', 1)]
+        rng = random.Random(options['seed'])
+        plan = rng.choices(
+            [path for path, _ in targets],
+            [weight for _, weight in targets],
+            k=options['requests'],
+        )
+        base_url = options['base_url'].rstrip('/')
+        local = threading.local()
+
+        def fetch(path):
+            if not hasattr(local, 'session'):
+                local.session = requests.Session()
+            started = time.perf_counter()
+            try:
+                response = local.session.get(
+                    base_url + path, timeout=options['timeout']
+                )
+                ok = response.status_code < 500
+            except requests.RequestException:
+                ok = False
+            return path, ok, (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as executor:
+            results = list(executor.map(fetch, plan))
+        elapsed = time.perf_counter() - started
+
+        report = {
+            'label': options['label'],
+            'revision': git_revision(),
+            'concurrency': options['concurrency'],
+            'requests': len(results),
+            'errors': sum(not ok for _, ok, _ in results),
+            'seconds': round(elapsed, 3),
+            'throughput_rps': round(len(results) / elapsed, 2),
+            'targets': {},
+        }
+        for path, _ in targets:
+            timings = [ms for url, _, ms in results if url == path]
+            if not timings:
+                continue
+            row = report['targets'][path] = {'requests': len(timings)}
+            for percent in PERCENTILES:
+                row[f'p{percent}_ms'] = round(
+                    percentile(timings, percent), 3
+                )
+        self.stdout.write(
+            f'{report["label"]}: {report["throughput_rps"]} rps, '
+            f'ошибок {report["errors"]} из {report["requests"]}'
+        )
+        for path, row in report['targets'].items():
+            self.stdout.write(
+                f'  {path:<30} p50={row["p50_ms"]:.1f}ms '
+                f'p95={row["p95_ms"]:.1f}ms p99={row["p99_ms"]:.1f}ms'
+            )
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2, ensure_ascii=False)
@@ -0,0 +1,213 @@
+import json
+import platform
+import subprocess
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.routers import read_databases
+from ...archive import hot_databases
+from ...models import Follow, Group, Post, User
+from ...sharding import gather
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = max(int(round(percent / 100 * len(ordered))) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def most_posts(field):
+    """Значение field, у которого больше всего постов на всех шардах."""
+    totals = Counter()
+    for alias in hot_databases():
+        totals.update(dict(
+            Post.objects.using(alias).filter(**{f'{field}__isnull': False})
+            .values_list(field).annotate(total=Count('pk')).order_by()
+        ))
+    return totals.most_common(1)[0][0] if totals else None
+
+
+def fetched_bytes(connection, queries):
+    """Объём данных, которые вернули SELECT-запросы страницы."""
+    total = 0
+    with connection.cursor() as cursor:
+        for query in queries:
+            if not query['sql'].lstrip().upper().startswith('SELECT'):
+                continue
+            cursor.execute(query['sql'])
+            for row in cursor.fetchall():
+                total += sum(
+                    len(value if isinstance(value, bytes) else
+                        str(value).encode())
+                    for value in row if value is not None
+                )
+    return total
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогоняет основные страницы через тестовый клиент и пишет '
+        'отчёт с перцентилями задержки и числом SQL-запросов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--output', default=None,
+                            help='Куда записать JSON-отчёт.')
+        parser.add_argument('--compare', default=None,
+                            help='Предыдущий отчёт для сравнения.')
+        parser.add_argument('--keep-cache', action='store_true',
+                            help='Не сбрасывать кеш перед запросами.')
+
+    def handle(self, *args, **options):
+        if not gather(Post.objects.all()).count():
+            raise CommandError('База пуста, сначала запустите seed_bench.')
+        self.keep_cache = options['keep_cache']
+        client = Client()
+        report = {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'dataset': {
+                'posts': gather(Post.objects.all()).count(),
+                'users': User.objects.count(),
+                'groups': Group.objects.count(),
+                'follows': Follow.objects.count(),
+            },
+            'views': {},
+        }
+        for name, url, user in self.targets():
+            if user is None:
+                client.logout()
+            else:
+                client.force_login(user)
+            report['views'][name] = self.measure(
+                client, url, options['repeat'], options['warmup']
+            )
+            self.stdout.write(self.format_row(name, report['views'][name]))
+        if options['compare']:
+            self.compare(report, options['compare'])
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2, ensure_ascii=False)
+
+    def targets(self):
+        post = gather(Post.objects.all())[0]
+        # Посты могут лежать на шардах: JOIN с ними в default не видит.
+        author = User.objects.get(pk=most_posts('author_id'))
+        group = Group.objects.filter(pk=most_posts('group_id')).first()
+        # Подписки всегда в default.
+        follower = User.objects.annotate(
+            total=Count('follower')
+        ).order_by('-total').first()
+        yield 'index', reverse('posts:index'), None
+        # get_page не понимает 'last' и отдаёт первую страницу.
+        last_page = Paginator(
+            gather(Post.objects.all()), settings.LIMIT_OF_POSTS
+        ).num_pages
+        yield 'index_page_last', (
+            reverse('posts:index') + f'?page={last_page}'
+        ), None
+        if group is not None:
+            yield 'group_posts', reverse(
+                'posts:group_list', args=[group.slug]
+            ), None
+        yield 'profile', reverse('posts:profile', args=[author.username]), None
+        yield 'post_detail', reverse(
+            'posts:post_detail', args=[post.pk]
+        ), None
+        yield 'follow_index', reverse('posts:follow_index'), follower
+
+    def measure(self, client, url, repeat, warmup):
+        for _ in range(warmup):
+            self.request(client, url)
+        timings = []
+        queries = []
+        for _ in range(repeat):
+            if not self.keep_cache:
+                cache.clear()
+            # Посты лежат на шардах и в архиве: запросы считаются
+            # по всем базам, а не только по default.
+            with ExitStack() as stack:
+                captured = [
+                    stack.enter_context(
+                        CaptureQueriesContext(connections[alias])
+                    )
+                    for alias in read_databases()
+                ]
+                started = time.perf_counter()
+                response = self.request(client, url)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(sum(len(context) for context in captured))
+        result = {
+            'url': url,
+            'status': response.status_code,
+            'bytes': len(response.content),
+            'db_bytes': sum(
+                fetched_bytes(context.connection, context.captured_queries)
+                for context in captured
+            ),
+            'queries': max(queries),
+            'mean_ms': round(sum(timings) / len(timings), 3),
+        }
+        for percent in PERCENTILES:
+            result[f'p{percent}_ms'] = round(percentile(timings, percent), 3)
+        return result
+
+    def request(self, client, url):
+        response = client.get(url)
+        if response.status_code >= 400:
+            raise CommandError(f'{url} вернул {response.status_code}')
+        return response
+
+    def format_row(self, name, row):
+        return (
+            f'{name:<16} p50={row["p50_ms"]:>9.2f}ms '
+            f'p95={row["p95_ms"]:>9.2f}ms p99={row["p99_ms"]:>9.2f}ms '
+            f'queries={row["queries"]} db={row["db_bytes"]}B'
+        )
+
+    def compare(self, report, path):
+        with open(path) as baseline_file:
+            baseline = json.load(baseline_file)
+        self.stdout.write(
+            f'Сравнение с {baseline.get("revision") or path}:'
+        )
+        for name, row in report['views'].items():
+            before = baseline['views'].get(name)
+            if before is None:
+                continue
+            delta = row['p95_ms'] - before['p95_ms']
+            percent = delta / before['p95_ms'] * 100 if before['p95_ms'] else 0
+            queries = row['queries'] - before['queries']
+            db_bytes = row['db_bytes'] - before.get('db_bytes', 0)
+            style = self.style.ERROR if percent > 10 else self.style.SUCCESS
+            self.stdout.write(style(
+                f'{name:<16} p95 {delta:+.2f}ms ({percent:+.1f}%) '
+                f'queries {queries:+d} db {db_bytes:+d}B'
+            ))
@@ -0,0 +1,136 @@
+import hashlib
+import heapq
+import os
+import time
+from array import array
+from bisect import bisect_left
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from sorl.thumbnail import delete as delete_image
+
+from ...deletion import post_databases
+from ...models import Post
+
+# Столько хешей сортируется за раз обычным списком Python.
+SORT_CHUNK = 65536
+
+
+def name_hash(name):
+    return int.from_bytes(
+        hashlib.blake2b(name.encode(), digest_size=8).digest(), 'big'
+    )
+
+
+class ReferencedNames:
+    """
+    Имена картинок постов как отсортированный массив 64-битных хешей.
+
+    Восемь байт на пост вместо строки в set; при коллизии хешей файл
+    считается используемым и просто не удаляется. Хеши сортируются
+    кусками по SORT_CHUNK и сливаются в итоговый массив, так что
+    в пике нужно около 16 байт на пост и один кусок списком.
+    """
+
+    def __init__(self, names):
+        chunks = []
+        chunk = []
+        for name in names:
+            chunk.append(name_hash(name))
+            if len(chunk) >= SORT_CHUNK:
+                chunks.append(self.sorted_chunk(chunk))
+                chunk = []
+        chunks.append(self.sorted_chunk(chunk))
+        self.hashes = array('Q', heapq.merge(*chunks))
+
+    @staticmethod
+    def sorted_chunk(chunk):
+        chunk.sort()
+        return array('Q', chunk)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __contains__(self, name):
+        value = name_hash(name)
+        index = bisect_left(self.hashes, value)
+        return index < len(self.hashes) and self.hashes[index] == value
+
+
+def referenced_names():
+    for alias in post_databases():
+        yield from Post.objects.using(alias).exclude(image='').values_list(
+            'image', flat=True
+        ).iterator()
+
+
+def walk(root, prefix):
+    """Обходит каталог потоком, не собирая список файлов целиком."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            name = f'{prefix}/{entry.name}'
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk(entry.path, name)
+            elif entry.is_file(follow_symlinks=False):
+                yield name, entry.stat()
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет из MEDIA_ROOT картинки постов, на которые не ссылается '
+        'ни один пост, вместе с их миниатюрами sorl.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Только показать, что будет удалено.')
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--rate', type=float, default=0,
+                            help='Не больше стольких файлов в секунду.')
+        parser.add_argument('--min-age', type=int, default=3600,
+                            help='Не трогать файлы моложе, секунды.')
+
+    def handle(self, *args, **options):
+        upload_to = Post._meta.get_field('image').upload_to.rstrip('/')
+        try:
+            root = default_storage.path(upload_to)
+        except NotImplementedError:
+            raise CommandError('gc_media работает только с локальным '
+                               'хранилищем файлов.')
+        if not os.path.isdir(root):
+            return
+        referenced = ReferencedNames(referenced_names())
+        self.stdout.write(f'Картинок у постов: {len(referenced)}')
+        newest = time.time() - options['min_age']
+        batch = []
+        orphans = freed = 0
+        for name, stat in walk(root, upload_to):
+            if name in referenced or stat.st_mtime > newest:
+                continue
+            orphans += 1
+            freed += stat.st_size
+            if options['dry_run']:
+                self.stdout.write(f'  {name}')
+                continue
+            batch.append(name)
+            if len(batch) >= options['batch_size']:
+                self.delete(batch, options['rate'])
+                batch = []
+        if batch:
+            self.delete(batch, options['rate'])
+        action = 'Будет удалено' if options['dry_run'] else 'Удалено'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} файлов: {orphans}, {freed / 1024 / 1024:.1f} МБ'
+        ))
+
+    def delete(self, names, rate):
+        started = time.monotonic()
+        for name in names:
+            # Вместе с файлом удаляются миниатюры sorl и их записи в kvstore.
+            delete_image(name)
+        if rate:
+            # Пауза выравнивает нагрузку на диск до rate файлов в секунду.
+            time.sleep(max(
+                len(names) / rate - (time.monotonic() - started), 0
+            ))
+        self.stdout.write(f'  удалено {len(names)}')
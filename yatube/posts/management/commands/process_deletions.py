@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...deletion import pending, run, schedule
+from ...models import Group, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Ставит пользователей и группы в очередь на удаление и выполняет '
+        'очередь пачками. Запускается фоновым воркером или по cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', default=[],
+                            help='Имя пользователя для удаления.')
+        parser.add_argument('--group', action='append', default=[],
+                            help='Slug группы для удаления.')
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--pause', type=float, default=None,
+                            help='Пауза между пачками, секунды.')
+
+    def handle(self, *args, **options):
+        try:
+            targets = [
+                *(User.objects.get(username=name) for name in options['user']),
+                *(Group.objects.get(slug=slug) for slug in options['group']),
+            ]
+        except (User.DoesNotExist, Group.DoesNotExist) as error:
+            raise CommandError(error)
+        for target in targets:
+            schedule(target)
+        for deletion in pending():
+            self.stdout.write(f'{deletion}: строк {deletion.total}')
+            run(
+                deletion,
+                options['batch_size'],
+                options['pause'],
+                progress=self.progress,
+            )
+            self.stdout.write(self.style.SUCCESS(f'{deletion}: удалено'))
+
+    def progress(self, deletion):
+        self.stdout.write(
+            f'  {deletion}: {deletion.processed}/{deletion.total}'
+        )
@@ -0,0 +1,251 @@
+import io
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+from faker import Faker
+from PIL import Image
+
+from ...archive import keep_auto_dates
+from ...models import Comment, Follow, Group, Post, User
+from ...sharding import mirror_aliases, next_post_id, shard_for
+from ...text import render_text
+
+USERNAME_PREFIX = 'bench_'
+TEXT_POOL_SIZE = 1000
+IMAGE_POOL_SIZE = 20
+
+
+def pareto_weights(count, alpha, rng):
+    return [rng.paretovariate(alpha) for _ in range(count)]
+
+
+def make_image(color, size=(480, 339)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполняет базу синтетическими данными для нагрузочных тестов: '
+        'степенное распределение подписчиков, неравномерные группы, '
+        'картинки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10_000)
+        parser.add_argument('--users', type=int, default=None)
+        parser.add_argument('--groups', type=int, default=50)
+        parser.add_argument('--comments', type=float, default=0.5,
+                            help='Среднее число комментариев на пост.')
+        parser.add_argument('--images', type=float, default=0.1,
+                            help='Доля постов с картинкой.')
+        parser.add_argument('--days', type=int, default=365)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--locale', default='ru_RU')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.fake = Faker(options['locale'])
+        self.fake.seed_instance(options['seed'])
+        self.batch_size = options['batch_size']
+        self.texts = [
+            self.fake.paragraph(nb_sentences=self.rng.randint(1, 12))
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+        # bulk_create не вызывает save(), разметка готовится заранее.
+        self.rendered = {text: render_text(text) for text in self.texts}
+        users_count = options['users'] or max(options['posts'] // 20, 10)
+
+        users = self.create_users(users_count)
+        groups = self.create_groups(options['groups'])
+        images = self.create_images(options['images'])
+        self.create_follows(users)
+        post_ids = self.create_posts(
+            options['posts'], users, groups,
+            images, options['images'], options['days']
+        )
+        self.create_comments(
+            int(options['posts'] * options['comments']), users, post_ids
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: пользователей {len(users)}, групп {len(groups)}, '
+            f'постов {options["posts"]}.'
+        ))
+
+    def create_users(self, count):
+        start = User.objects.filter(
+            username__startswith=USERNAME_PREFIX
+        ).count()
+        User.objects.bulk_create(
+            (
+                User(
+                    username=f'{USERNAME_PREFIX}{start + i}',
+                    first_name=self.fake.first_name(),
+                    last_name=self.fake.last_name(),
+                    password='!',
+                )
+                for i in range(count)
+            ),
+            batch_size=self.batch_size,
+        )
+        return self.mirror(
+            User.objects.filter(
+                username__startswith=USERNAME_PREFIX
+            ).order_by('-pk')[:count]
+        )
+
+    def create_groups(self, count):
+        start = Group.objects.count()
+        Group.objects.bulk_create(
+            Group(
+                title=self.fake.catch_phrase()[:200],
+                slug=f'bench-{start + i}',
+                description=self.fake.text(),
+            )
+            for i in range(count)
+        )
+        return self.mirror(
+            Group.objects.filter(
+                slug__startswith='bench-'
+            ).order_by('-pk')[:count]
+        )
+
+    def mirror(self, queryset):
+        """Копирует созданные объекты на шарды и в архив, отдаёт их id."""
+        objects = list(queryset)
+        # bulk_create не шлёт post_save, и сигнал mirror_saved не сработает.
+        for alias in mirror_aliases():
+            queryset.model._base_manager.using(alias).bulk_create(
+                objects, batch_size=self.batch_size, ignore_conflicts=True
+            )
+        return [obj.pk for obj in objects]
+
+    def create_images(self, share):
+        if not share:
+            return []
+        field = Post._meta.get_field('image')
+        names = []
+        for i in range(IMAGE_POOL_SIZE):
+            color = tuple(self.rng.randrange(256) for _ in range(3))
+            names.append(field.storage.save(
+                field.generate_filename(None, f'bench_{i}.jpg'),
+                ContentFile(make_image(color)),
+            ))
+        return names
+
+    def create_follows(self, users):
+        # Популярность авторов и активность подписчиков распределены
+        # по степенному закону: немногие авторы собирают почти всех.
+        popularity = pareto_weights(len(users), 1.2, self.rng)
+        follows = set()
+        for user in users:
+            wanted = min(int(self.rng.paretovariate(1.5)), len(users) - 1)
+            for author in self.rng.choices(users, popularity, k=wanted):
+                if author != user:
+                    follows.add((user, author))
+        Follow.objects.bulk_create(
+            (Follow(user_id=user, author_id=author)
+             for user, author in follows),
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+
+    def create_posts(self, count, users, groups, images, share, days):
+        activity = pareto_weights(len(users), 1.1, self.rng)
+        group_sizes = pareto_weights(len(groups), 1.0, self.rng)
+        now = timezone.now()
+        created = 0
+        bounds = {}
+        with keep_auto_dates():
+            while created < count:
+                size = min(self.batch_size, count - created)
+                authors = self.rng.choices(users, activity, k=size)
+                batches = {}
+                for author in authors:
+                    post = Post(
+                        author_id=author,
+                        group_id=(
+                            self.rng.choices(groups, group_sizes)[0]
+                            if groups and self.rng.random() < 0.7 else None
+                        ),
+                        text=self.rng.choice(self.texts),
+                        image=(
+                            self.rng.choice(images)
+                            if images and self.rng.random() < share
+                            else ''
+                        ),
+                        pub_date=now - timedelta(
+                            seconds=self.rng.randrange(days * 86400)
+                        ),
+                    )
+                    (
+                        post.text_html, post.excerpt, post.excerpt_truncated
+                    ) = self.rendered[post.text]
+                    alias = (
+                        shard_for(author) if settings.POST_SHARDS
+                        else DEFAULT_DB_ALIAS
+                    )
+                    batches.setdefault(alias, []).append(post)
+                for alias, batch in batches.items():
+                    first, last = self.insert_posts(alias, batch)
+                    bounds[alias] = (bounds.get(alias, (first,))[0], last)
+                created += size
+                self.stdout.write(f'Посты: {created}/{count}')
+        # Идентификаторы на каждой базе идут с постоянным шагом, поэтому
+        # хранить весь список не нужно даже для десятков миллионов постов.
+        step = len(settings.POST_SHARDS) or 1
+        return {
+            alias: range(first, last + 1, step)
+            for alias, (first, last) in bounds.items()
+        }
+
+    def insert_posts(self, alias, batch):
+        """Вставляет посты на базу alias, отдаёт первый и последний id."""
+        if not settings.POST_SHARDS:
+            with transaction.atomic():
+                Post.objects.bulk_create(batch)
+            last = Post.objects.order_by('-pk').values_list(
+                'pk', flat=True
+            ).first()
+            return last - len(batch) + 1, last
+        # bulk_create не вызывает pre_save, id с остатком шарда
+        # резервируются сразу на всю пачку.
+        step = len(settings.POST_SHARDS)
+        last = next_post_id(alias, len(batch))
+        first = last - (len(batch) - 1) * step
+        for pk, post in zip(range(first, last + 1, step), batch):
+            post.pk = pk
+        with transaction.atomic(using=alias):
+            Post.objects.using(alias).bulk_create(batch)
+        return first, last
+
+    def create_comments(self, count, users, post_ids):
+        total = sum(len(ids) for ids in post_ids.values())
+        if not total:
+            return
+        # Комментарии лежат на шарде поста и делятся пропорционально
+        # числу постов; накопленная сумма не теряет остатки деления.
+        done = 0
+        for alias, ids in post_ids.items():
+            share = count * (done + len(ids)) // total - count * done // total
+            done += len(ids)
+            created = 0
+            while created < share:
+                size = min(self.batch_size, share - created)
+                with transaction.atomic(using=alias):
+                    Comment.objects.using(alias).bulk_create(
+                        Comment(
+                            post_id=self.rng.choice(ids),
+                            author_id=self.rng.choice(users),
+                            text=self.rng.choice(self.texts),
+                        )
+                        for _ in range(size)
+                    )
+                created += size
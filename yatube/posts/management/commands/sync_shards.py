@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...sharding import REFERENCE_MODELS, mirror, mirror_aliases
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует пользователей и группы из основной БД на шарды постов '
+        'и в архив. Нужен один раз при включении POST_SHARDS или '
+        'ARCHIVE_DATABASE, дальше копии обновляются сигналами.'
+    )
+
+    def handle(self, *args, **options):
+        aliases = mirror_aliases()
+        if not aliases:
+            raise CommandError(
+                'Не заданы ни POST_SHARDS, ни ARCHIVE_DATABASE.'
+            )
+        for model in REFERENCE_MODELS:
+            total = 0
+            for instance in model._base_manager.iterator():
+                mirror(instance, aliases)
+                total += 1
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: {total} '
+                f'скопировано в {", ".join(aliases)}'
+            )
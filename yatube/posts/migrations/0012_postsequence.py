@@ -0,0 +1,24 @@
+# Generated by Django 2.2.16 on 2026-10-19 20:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_post_text_html'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSequence',
+            fields=[
+                ('alias', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Шард')),
+                ('last_id', models.BigIntegerField(verbose_name='Последний id')),
+            ],
+            options={
+                'verbose_name': 'Счётчик id постов',
+                'verbose_name_plural': 'Счётчики id постов',
+            },
+        ),
+    ]
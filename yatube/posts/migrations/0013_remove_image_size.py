@@ -0,0 +1,21 @@
+# Generated by Django 2.2.16 on 2026-10-19 20:24
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_postsequence'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='post',
+            name='image_height',
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='image_width',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 20:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_remove_image_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt_truncated',
+            field=models.BooleanField(editable=False, null=True, verbose_name='Выдержка обрезана'),
+        ),
+    ]
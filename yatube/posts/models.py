@@ -2,10 +2,30 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from .images import placeholder_color
+from .text import render_text
+
 
 User = get_user_model()
 
 
+class RoutedQuerySet(models.QuerySet):
+    def create(self, **kwargs):
+        if self._db is not None:
+            return super().create(**kwargs)
+        # Без явной БД роутер выбирает её по самому объекту (шард автора).
+        obj = self.model(**kwargs)
+        self._for_write = True
+        obj.save(force_insert=True)
+        return obj
+
+
+class PostQuerySet(RoutedQuerySet):
+    def for_list(self):
+        """Без полного текста: ленте хватает выдержки."""
+        return self.defer('text', 'text_html')
+
+
 class Group(models.Model):
     title = models.CharField(
         max_length=200,
@@ -61,6 +81,35 @@ class Post(models.Model):
         upload_to='posts/',
         blank=True,
     )
+    # Заполняется при загрузке, чтобы не открывать файл при отрисовке.
+    # Размеры не хранятся: миниатюры режутся до заданной геометрии.
+    image_placeholder = models.CharField(
+        'Цвет заглушки картинки',
+        max_length=7,
+        blank=True,
+        editable=False,
+    )
+    # Заполняются при сохранении, чтобы не форматировать текст
+    # при каждой отрисовке.
+    text_html = models.TextField(
+        'Текст в HTML',
+        blank=True,
+        editable=False,
+    )
+    excerpt = models.TextField(
+        'Выдержка из текста',
+        blank=True,
+        editable=False,
+    )
+    # Ссылка «Читать дальше» нужна только обрезанным выдержкам, а полный
+    # текст в ленте не загружается. None - ещё не посчитано.
+    excerpt_truncated = models.BooleanField(
+        'Выдержка обрезана',
+        null=True,
+        editable=False,
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         ordering = ('-pub_date',)
@@ -70,6 +119,16 @@ class Post(models.Model):
     def __str__(self) -> str:
         return self.text[:settings.CROP_TEXT]
 
+    def save(self, *args, **kwargs):
+        if not self.image:
+            self.image_placeholder = ''
+        elif not self.image._committed:
+            self.image_placeholder = placeholder_color(self.image)
+        self.text_html, self.excerpt, self.excerpt_truncated = render_text(
+            self.text
+        )
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     post = models.ForeignKey(
@@ -92,6 +151,8 @@ class Comment(models.Model):
         auto_now_add=True,
     )
 
+    objects = RoutedQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Коментарии'
@@ -117,3 +178,66 @@ class Follow(models.Model):
         constraints = [models.UniqueConstraint(
             fields=['user', 'author'], name='unique_following'
         )]
+
+
+class Deletion(models.Model):
+    USER = 'user'
+    GROUP = 'group'
+    TARGETS = (
+        (USER, 'Пользователь'),
+        (GROUP, 'Группа'),
+    )
+
+    target = models.CharField(
+        max_length=10,
+        choices=TARGETS,
+        verbose_name='Что удаляется',
+    )
+    object_id = models.PositiveIntegerField(
+        verbose_name='id объекта',
+    )
+    processed = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Обработано строк',
+    )
+    total = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Всего строк',
+    )
+    created = models.DateTimeField(
+        verbose_name='Дата постановки',
+        auto_now_add=True,
+    )
+    finished = models.DateTimeField(
+        verbose_name='Дата завершения',
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        ordering = ('created',)
+        verbose_name = 'Удаление'
+        verbose_name_plural = 'Удаления'
+        constraints = [models.UniqueConstraint(
+            fields=['target', 'object_id'], name='unique_deletion'
+        )]
+
+    def __str__(self) -> str:
+        return f'{self.get_target_display()} {self.object_id}'
+
+
+class PostSequence(models.Model):
+    """Последний выданный id поста на шарде; хранится в основной БД."""
+
+    alias = models.CharField(
+        max_length=100,
+        primary_key=True,
+        verbose_name='Шард',
+    )
+    last_id = models.BigIntegerField(
+        verbose_name='Последний id',
+    )
+
+    class Meta:
+        verbose_name = 'Счётчик id постов'
+        verbose_name_plural = 'Счётчики id постов'
@@ -0,0 +1,192 @@
+import heapq
+from itertools import islice
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import F, Max
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .models import Comment, Follow, Group, Post, PostSequence, User
+
+# Справочные таблицы копируются на шарды и в архив, чтобы работали JOIN.
+REFERENCE_MODELS = (User, Group)
+# Подсказкой роутеру бывает сам объект или владелец связанного менеджера.
+SHARD_KEYS = {
+    Post: ((Post, 'author_id'), (User, 'pk')),
+    Comment: ((Comment, 'post_id'), (Post, 'pk')),
+}
+
+
+def mirror_aliases():
+    aliases = list(settings.POST_SHARDS)
+    if settings.ARCHIVE_DATABASE is not None:
+        aliases.append(settings.ARCHIVE_DATABASE)
+    return aliases
+
+
+def shard_for(key):
+    """Шард автора; id поста даёт тот же остаток, что и id автора."""
+    shards = settings.POST_SHARDS
+    return shards[key % len(shards)]
+
+
+def on_shard(queryset, key):
+    if not settings.POST_SHARDS:
+        return queryset
+    return queryset.using(shard_for(key))
+
+
+def sort_key(post):
+    return post.pub_date, post.pk
+
+
+class MergedPosts:
+    """Посты нескольких шардов, слитые по дате публикации для Paginator."""
+
+    def __init__(self, querysets):
+        self.querysets = [
+            queryset.order_by('-pub_date', '-pk') for queryset in querysets
+        ]
+
+    def count(self):
+        return sum(queryset.count() for queryset in self.querysets)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        # С каждого шарда нужны только первые stop записей.
+        merged = heapq.merge(
+            *(queryset[:index.stop] for queryset in self.querysets),
+            key=sort_key,
+            reverse=True,
+        )
+        return list(islice(merged, index.start or 0, index.stop))
+
+
+def gather(queryset):
+    """Запрос ко всем шардам с k-way слиянием результатов."""
+    if not settings.POST_SHARDS:
+        return queryset
+    return MergedPosts(
+        queryset.using(alias) for alias in settings.POST_SHARDS
+    )
+
+
+def followed_posts(user):
+    if not settings.POST_SHARDS:
+        return Post.objects.for_list().filter(author__following__user=user)
+    # Подписки лежат в основной БД, опрашиваются только нужные шарды.
+    authors = {}
+    for author_id in Follow.objects.filter(user=user).values_list(
+        'author_id', flat=True
+    ):
+        authors.setdefault(shard_for(author_id), []).append(author_id)
+    return MergedPosts(
+        Post.objects.for_list().using(alias).filter(author_id__in=author_ids)
+        for alias, author_ids in authors.items()
+    )
+
+
+class ShardRouter:
+    """Пишет посты и комментарии на шард автора из POST_SHARDS."""
+
+    def db_for_write(self, model, **hints):
+        instance = hints.get('instance')
+        if not settings.POST_SHARDS or instance is None:
+            return None
+        for hint_model, attname in SHARD_KEYS.get(model, ()):
+            if isinstance(instance, hint_model):
+                key = getattr(instance, attname)
+                return None if key is None else shard_for(key)
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if settings.POST_SHARDS and {type(obj1), type(obj2)} & {
+            Post, Comment
+        }:
+            return True
+        return None
+
+
+def first_post_id(alias):
+    # Архив учитывается, чтобы не выдать заново id перенесённых постов.
+    shards = settings.POST_SHARDS
+    aliases = [alias]
+    if settings.ARCHIVE_DATABASE is not None:
+        aliases.append(settings.ARCHIVE_DATABASE)
+    last = max(
+        Post._base_manager.using(alias).aggregate(last=Max('pk'))['last']
+        or 0
+        for alias in aliases
+    )
+    return last + 1 + (shards.index(alias) - last - 1) % len(shards)
+
+
+def next_post_id(alias, count=1):
+    """
+    Следующий id поста на шарде с остатком этого шарда.
+
+    Счётчик сдвигается UPDATE ... SET last_id = last_id + N: строка
+    блокируется до конца транзакции, и одновременные вставки получают
+    разные id. MAX(pk) считается только при создании счётчика.
+    С count резервируется count id с шагом в число шардов
+    и возвращается последний из них.
+    """
+    step = len(settings.POST_SHARDS)
+    sequences = PostSequence.objects.using(DEFAULT_DB_ALIAS)
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        if sequences.filter(alias=alias).update(
+            last_id=F('last_id') + count * step
+        ):
+            return sequences.get(alias=alias).last_id
+        try:
+            with transaction.atomic(using=DEFAULT_DB_ALIAS):
+                return sequences.create(
+                    alias=alias,
+                    last_id=first_post_id(alias) + (count - 1) * step,
+                ).last_id
+        except IntegrityError:
+            # Счётчик одновременно создал другой процесс.
+            pass
+    return next_post_id(alias, count)
+
+
+def allocate_post_id(sender, instance, using, raw=False, **kwargs):
+    # Автоинкременты шардов пересекаются, поэтому id с остатком шарда.
+    if raw or instance.pk is not None or using not in settings.POST_SHARDS:
+        return
+    instance.pk = next_post_id(using)
+
+
+def mirror(instance, aliases=None):
+    model = type(instance)
+    fields = {
+        field.attname: getattr(instance, field.attname)
+        for field in model._meta.concrete_fields
+        if not field.primary_key
+    }
+    for alias in aliases or mirror_aliases():
+        model._base_manager.using(alias).update_or_create(
+            pk=instance.pk, defaults=fields
+        )
+
+
+def mirror_saved(sender, instance, using, raw=False, **kwargs):
+    if using == DEFAULT_DB_ALIAS and not raw and mirror_aliases():
+        mirror(instance)
+
+
+def mirror_deleted(sender, instance, using, **kwargs):
+    if using == DEFAULT_DB_ALIAS:
+        for alias in mirror_aliases():
+            sender._base_manager.using(alias).filter(pk=instance.pk).delete()
+
+
+def connect_signals():
+    pre_save.connect(allocate_post_id, sender=Post)
+    for model in REFERENCE_MODELS:
+        post_save.connect(mirror_saved, sender=model)
+        post_delete.connect(mirror_deleted, sender=model)
@@ -0,0 +1,90 @@
+import datetime as dt
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..archive import archive_batch
+from ..models import Comment, Group, Post, User
+
+INDEX_URL = reverse('posts:index')
+
+
+@override_settings(ARCHIVE_DATABASE='archive', ARCHIVE_AFTER_DAYS=30)
+class ArchiveTest(TestCase):
+    databases = {'default', 'archive'}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.old = Post.objects.create(
+            author=cls.user, group=cls.group, text='Старый пост'
+        )
+        cls.old_date = timezone.now() - dt.timedelta(days=60)
+        Post.objects.filter(pk=cls.old.pk).update(pub_date=cls.old_date)
+        Comment.objects.create(
+            post=cls.old, author=cls.user, text='Старый комментарий'
+        )
+        cls.new = Post.objects.create(author=cls.user, text='Новый пост')
+        cls.PROFILE_URL = reverse('posts:profile', args=['author'])
+        cls.OLD_URL = reverse('posts:post_detail', args=[cls.old.pk])
+
+    def setUp(self):
+        cache.clear()
+        call_command('archive_posts', stdout=StringIO())
+
+    def test_old_posts_move_to_archive(self):
+        """Старые посты с комментариями уходят из горячей таблицы."""
+        self.assertEqual(
+            list(Post.objects.values_list('pk', flat=True)), [self.new.pk]
+        )
+        self.assertFalse(Comment.objects.exists())
+        archived = Post.objects.using('archive').get()
+        self.assertEqual(archived.pk, self.old.pk)
+        self.assertEqual(archived.pub_date, self.old_date)
+        self.assertEqual(archived.group_id, self.group.pk)
+        self.assertEqual(
+            archived.comments.get().text, 'Старый комментарий'
+        )
+
+    def test_archiving_is_repeatable(self):
+        """Повторный перенос уже перенесённой пачки ничего не портит."""
+        archive_batch('default', [self.old.pk])
+        self.assertEqual(Post.objects.using('archive').count(), 1)
+        self.assertEqual(Comment.objects.using('archive').count(), 1)
+
+    def test_archived_post_detail(self):
+        """Архивный пост открывается, но без формы комментария."""
+        response = self.client.get(self.OLD_URL)
+        self.assertContains(response, 'Старый пост')
+        self.assertContains(response, 'Старый комментарий')
+        self.assertTrue(response.context['archived'])
+        self.assertNotContains(response, 'Добавить комментарий')
+
+    def test_profile_includes_archive(self):
+        """Профиль показывает горячие и архивные посты по дате."""
+        response = self.client.get(self.PROFILE_URL)
+        self.assertEqual(
+            [post.pk for post in response.context['page_obj']],
+            [self.new.pk, self.old.pk],
+        )
+        self.assertEqual(response.context['page_obj'].paginator.count, 2)
+        self.assertContains(response, 'Всего постов: 2')
+        for url in (
+            self.OLD_URL, reverse('posts:post_detail', args=[self.new.pk])
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.context['author_posts_count'], 2)
+
+    def test_index_reads_hot_table(self):
+        """Главная читает только горячую таблицу."""
+        response = self.client.get(INDEX_URL)
+        self.assertEqual(list(response.context['page_obj']), [self.new])
@@ -0,0 +1,191 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db.models import F
+from django.test import LiveServerTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from ..management.commands.gc_media import ReferencedNames
+from ..models import Comment, Follow, Group, Post, User
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+GC_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class BenchCommandsTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def test_seed_bench_creates_dataset(self):
+        """seed_bench создаёт посты, группы, подписки и комментарии."""
+        call_command(
+            'seed_bench', posts=120, users=15, groups=4,
+            batch_size=50, stdout=StringIO()
+        )
+        self.assertEqual(Post.objects.count(), 120)
+        self.assertEqual(Group.objects.count(), 4)
+        self.assertEqual(Comment.objects.count(), 60)
+        self.assertFalse(Follow.objects.filter(
+            user_id=F('author_id')
+        ).exists())
+        self.assertGreater(
+            Post.objects.values('pub_date').distinct().count(), 1
+        )
+
+    def test_bench_views_writes_report(self):
+        """bench_views пишет JSON-отчёт по всем страницам."""
+        call_command(
+            'seed_bench', posts=30, users=5, groups=2,
+            images=0, stdout=StringIO()
+        )
+        with tempfile.NamedTemporaryFile('r', suffix='.json') as output:
+            call_command(
+                'bench_views', repeat=3, warmup=0,
+                output=output.name, stdout=StringIO()
+            )
+            report = json.load(output)
+        self.assertEqual(report['dataset']['posts'], 30)
+        for name in ('index', 'profile', 'post_detail', 'follow_index'):
+            with self.subTest(name=name):
+                row = report['views'][name]
+                self.assertEqual(row['status'], 200)
+                self.assertGreater(row['queries'], 0)
+                self.assertGreater(row['db_bytes'], 0)
+                self.assertLessEqual(row['p50_ms'], row['p99_ms'])
+
+
+@override_settings(POST_SHARDS=['shard_0', 'shard_1'])
+class ShardedBenchTest(TestCase):
+    databases = {'default', 'shard_0', 'shard_1'}
+
+    def test_bench_on_shards(self):
+        """seed_bench раскладывает данные по шардам, bench_views их видит."""
+        call_command(
+            'seed_bench', posts=30, users=5, groups=2,
+            images=0, stdout=StringIO()
+        )
+        for alias in ('shard_0', 'shard_1'):
+            with self.subTest(alias=alias):
+                self.assertTrue(User.objects.using(alias).exists())
+                self.assertTrue(Group.objects.using(alias).exists())
+                posts = Post.objects.using(alias)
+                self.assertTrue(posts.exists())
+                self.assertFalse(posts.exclude(
+                    author_id__in=User.objects.using(alias).values('pk')
+                ).exists())
+                self.assertFalse(Comment.objects.using(alias).exclude(
+                    post_id__in=posts.values('pk')
+                ).exists())
+        self.assertFalse(Post.objects.using('default').exists())
+        self.assertEqual(
+            sum(
+                Comment.objects.using(alias).count()
+                for alias in ('shard_0', 'shard_1')
+            ),
+            15,
+        )
+        with tempfile.NamedTemporaryFile('r', suffix='.json') as output:
+            call_command(
+                'bench_views', repeat=1, warmup=0,
+                output=output.name, stdout=StringIO()
+            )
+            report = json.load(output)
+        self.assertEqual(report['dataset']['posts'], 30)
+        totals = Counter()
+        for alias in ('shard_0', 'shard_1'):
+            totals.update(Post.objects.using(alias).values_list(
+                'author__username', flat=True
+            ))
+        most = max(totals.values())
+        self.assertIn(report['views']['profile']['url'], [
+            reverse('posts:profile', args=[username])
+            for username, total in totals.items() if total == most
+        ])
+        row = report['views']['index']
+        self.assertGreater(row['queries'], 0)
+        self.assertGreater(row['db_bytes'], 0)
+
+
+class BenchConcurrencyTest(LiveServerTestCase):
+    def test_bench_concurrency_reports_throughput(self):
+        """bench_concurrency считает пропускную способность сервера."""
+        with tempfile.NamedTemporaryFile('r', suffix='.json') as output:
+            call_command(
+                'bench_concurrency', base_url=self.live_server_url,
+                target=[('/about/tech/', 3), ('/', 1)], requests=8,
+                concurrency=2, output=output.name, stdout=StringIO()
+            )
+            report = json.load(output)
+        self.assertEqual(report['requests'], 8)
+        self.assertEqual(report['errors'], 0)
+        self.assertGreater(report['throughput_rps'], 0)
+        self.assertIn('/about/tech/', report['targets'])
+
+
+@override_settings(MEDIA_ROOT=GC_MEDIA_ROOT)
+class GcMediaTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        post = Post.objects.create(
+            author=User.objects.create_user(username='author'),
+            text='Пост с картинкой',
+        )
+        post.image.save('used.gif', ContentFile(b'used'))
+        cls.used = post.image.path
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(GC_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.old = self.make_file('posts/old/orphan.gif', age=7200)
+        self.young = self.make_file('posts/young.gif', age=0)
+        os.utime(self.used, (time.time() - 7200,) * 2)
+
+    def make_file(self, name, age):
+        path = os.path.join(GC_MEDIA_ROOT, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(b'orphan')
+        os.utime(path, (time.time() - age,) * 2)
+        return path
+
+    def test_gc_media_deletes_orphans(self):
+        """gc_media удаляет старые файлы без постов."""
+        call_command('gc_media', batch_size=1, stdout=StringIO())
+        self.assertFalse(os.path.exists(self.old))
+        self.assertTrue(os.path.exists(self.young))
+        self.assertTrue(os.path.exists(self.used))
+
+    def test_gc_media_dry_run(self):
+        """С --dry-run файлы только перечисляются."""
+        output = StringIO()
+        call_command('gc_media', dry_run=True, stdout=output)
+        self.assertIn('posts/old/orphan.gif', output.getvalue())
+        self.assertTrue(os.path.exists(self.old))
+
+    def test_referenced_names_merge_chunks(self):
+        """Хеши, отсортированные кусками, сливаются в один массив."""
+        names = [f'posts/{index}.gif' for index in range(50)]
+        with mock.patch(
+            'posts.management.commands.gc_media.SORT_CHUNK', 7
+        ):
+            referenced = ReferencedNames(iter(names))
+        self.assertEqual(len(referenced), 50)
+        self.assertEqual(list(referenced.hashes), sorted(referenced.hashes))
+        self.assertTrue(all(name in referenced for name in names))
+        self.assertNotIn('posts/missing.gif', referenced)
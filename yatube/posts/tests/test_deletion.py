@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..deletion import run, schedule
+from ..forms import PostForm
+from ..models import Comment, Deletion, Follow, Group, Post, User
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3A'
+)
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, DELETION_PAUSE=0)
+class DeletionTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+        Follow.objects.create(user=cls.author, author=cls.reader)
+        cls.posts = [
+            Post.objects.create(
+                author=cls.author, group=cls.group, text=f'Пост {index}'
+            )
+            for index in range(5)
+        ]
+        cls.posts[0].image.save('small.gif', ContentFile(SMALL_GIF))
+        cls.reader_post = Post.objects.create(
+            author=cls.reader, group=cls.group, text='Пост читателя'
+        )
+        for post in cls.posts[:2]:
+            Comment.objects.create(post=post, author=cls.reader, text='Ок')
+        Comment.objects.create(
+            post=cls.reader_post, author=cls.author, text='Ответ'
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_schedule_marks_user(self):
+        """Постановка в очередь блокирует вход и считает строки."""
+        deletion = schedule(self.author)
+        self.author.refresh_from_db()
+        self.assertFalse(self.author.is_active)
+        self.assertEqual(deletion.total, 2 + 1 + 2 + 5)
+        self.assertIsNone(deletion.finished)
+
+    def test_user_is_deleted_in_batches(self):
+        """Зависимые строки удаляются пачками, затем сам пользователь."""
+        image_path = self.posts[0].image.path
+        reports = []
+        run(
+            schedule(self.author),
+            batch_size=2,
+            progress=lambda deletion: reports.append(deletion.processed),
+        )
+        self.assertEqual(reports, [2, 3, 5, 7, 9, 10])
+        self.assertFalse(User.objects.filter(pk=self.author.pk).exists())
+        self.assertFalse(Follow.objects.exists())
+        self.assertEqual(list(Post.objects.all()), [self.reader_post])
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(os.path.exists(image_path))
+        self.assertIsNotNone(Deletion.objects.get().finished)
+
+    def test_group_is_deleted_in_batches(self):
+        """Посты группы отвязываются пачками, затем группа удаляется."""
+        call_command(
+            'process_deletions', group=['group'], batch_size=4,
+            stdout=StringIO(),
+        )
+        self.assertFalse(Group.objects.exists())
+        self.assertEqual(Post.objects.count(), 6)
+        self.assertFalse(Post.objects.filter(group__isnull=False).exists())
+
+    def test_group_hidden_while_deleting(self):
+        """Группа в очереди на удаление скрыта со страниц и из формы."""
+        url = reverse('posts:group_list', args=[self.group.slug])
+        self.assertEqual(self.client.get(url).status_code, 200)
+        schedule(self.group)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertNotIn(
+            self.group, PostForm().fields['group'].queryset
+        )
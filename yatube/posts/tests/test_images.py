@@ -0,0 +1,86 @@
+import io
+import shutil
+import tempfile
+from io import StringIO
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from ..models import Post, User
+
+INDEX_URL = reverse('posts:index')
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+def make_image(size, color):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='PNG')
+    return SimpleUploadedFile(
+        'image.png', buffer.getvalue(), content_type='image/png'
+    )
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class PostImageTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Пост с картинкой',
+            image=make_image((60, 30), (255, 0, 0)),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_upload_stores_placeholder(self):
+        """При загрузке сохраняется цвет заглушки."""
+        self.assertEqual(self.post.image_placeholder, '#ff0000')
+
+    def test_removing_image_clears_placeholder(self):
+        """Без картинки заглушка пуста."""
+        post = Post.objects.get(pk=self.post.pk)
+        post.image = ''
+        post.save()
+        self.assertEqual(post.image_placeholder, '')
+
+    def test_backfill_images(self):
+        """backfill_images заполняет заглушки старых картинок."""
+        Post.objects.filter(pk=self.post.pk).update(image_placeholder='')
+        call_command('backfill_images', stdout=StringIO())
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.image_placeholder, '#ff0000')
+
+    @skipUnless(
+        hasattr(Image, 'ANTIALIAS'),
+        'sorl-thumbnail не работает с Pillow без Image.ANTIALIAS',
+    )
+    def test_templates_reserve_image_space(self):
+        """У картинок в разметке есть размеры и ленивая загрузка."""
+        urls = (
+            INDEX_URL,
+            reverse('posts:profile', args=[self.user.username]),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, 'width="480" height="339"')
+                self.assertContains(response, 'loading="lazy"')
+                self.assertContains(response, 'background-color: #ff0000')
+        response = self.client.get(
+            reverse('posts:post_detail', args=[self.post.pk])
+        )
+        self.assertContains(response, 'width="960" height="339"')
@@ -0,0 +1,136 @@
+import datetime as dt
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Comment, Follow, Group, Post, PostSequence, User
+from ..sharding import shard_for
+
+SHARDS = ['shard_0', 'shard_1']
+INDEX_URL = reverse('posts:index')
+FOLLOW_INDEX_URL = reverse('posts:follow_index')
+
+
+@override_settings(POST_SHARDS=SHARDS)
+class ShardingTest(TestCase):
+    databases = {'default', *SHARDS}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.users = [
+            User.objects.create_user(username=f'user{index}')
+            for index in range(3)
+        ]
+        cls.reader = User.objects.create_user(username='reader')
+        Follow.objects.create(user=cls.reader, author=cls.users[0])
+        start = timezone.now() - dt.timedelta(days=1)
+        cls.posts = []
+        for index in range(settings.LIMIT_OF_POSTS + 3):
+            post = Post.objects.create(
+                author=cls.users[index % len(cls.users)],
+                group=cls.group if index % 2 else None,
+                text=f'Пост {index}',
+            )
+            # Даты чередуются между шардами, слияние должно их упорядочить.
+            post.pub_date = start + dt.timedelta(minutes=index)
+            post.save()
+            cls.posts.append(post)
+        cls.posts.reverse()
+
+    def setUp(self):
+        cache.clear()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def test_posts_live_on_author_shard(self):
+        """Посты пишутся на шард автора, а id указывает на тот же шард."""
+        self.assertFalse(Post.objects.using('default').exists())
+        for post in self.posts:
+            self.assertEqual(post._state.db, shard_for(post.author_id))
+            self.assertEqual(shard_for(post.pk), shard_for(post.author_id))
+        self.assertEqual(
+            len({post.pk for post in self.posts}), len(self.posts)
+        )
+
+    def test_reference_tables_are_mirrored(self):
+        """Пользователи и группы копируются на все шарды."""
+        for alias in SHARDS:
+            self.assertEqual(User.objects.using(alias).count(), 4)
+            self.assertTrue(
+                Group.objects.using(alias).filter(slug='group').exists()
+            )
+
+    def test_index_merges_shards(self):
+        """Главная страница сливает шарды по дате публикации."""
+        first = self.client.get(INDEX_URL).context['page_obj']
+        second = self.client.get(INDEX_URL + '?page=2').context['page_obj']
+        self.assertEqual(first.paginator.count, len(self.posts))
+        self.assertEqual(list(first) + list(second), self.posts)
+
+    def test_group_posts_merges_shards(self):
+        """Страница группы собирает посты группы со всех шардов."""
+        response = self.client.get(
+            reverse('posts:group_list', args=[self.group.slug])
+        )
+        self.assertEqual(
+            list(response.context['page_obj']),
+            [post for post in self.posts if post.group_id][
+                :settings.LIMIT_OF_POSTS
+            ],
+        )
+
+    def test_follow_index_reads_followed_shards(self):
+        """Лента подписок показывает только посты авторов из подписок."""
+        response = self.reader_client.get(FOLLOW_INDEX_URL)
+        self.assertEqual(
+            list(response.context['page_obj']),
+            [post for post in self.posts if post.author == self.users[0]],
+        )
+
+    def test_profile_and_post_detail(self):
+        """Профиль и пост читаются с нужного шарда."""
+        author = self.users[1]
+        post = next(post for post in self.posts if post.author == author)
+        response = self.client.get(
+            reverse('posts:profile', args=[author.username])
+        )
+        author_posts = [post for post in self.posts if post.author == author]
+        self.assertEqual(list(response.context['page_obj']), author_posts)
+        self.assertContains(response, f'Всего постов: {len(author_posts)}')
+        response = self.client.get(
+            reverse('posts:post_detail', args=[post.pk])
+        )
+        self.assertEqual(response.context['post'], post)
+
+    def test_comment_is_stored_with_post(self):
+        """Комментарий ложится на шард своего поста."""
+        post = self.posts[0]
+        self.reader_client.post(
+            reverse('posts:add_comment', args=[post.pk]),
+            {'text': 'Комментарий'},
+        )
+        comment = Comment.objects.using(post._state.db).get()
+        self.assertEqual(comment.post_id, post.pk)
+        self.assertContains(
+            self.client.get(reverse('posts:post_detail', args=[post.pk])),
+            'Комментарий',
+        )
+
+    def test_post_ids_come_from_sequence(self):
+        """id выдаёт счётчик шарда, удалённый id заново не выдаётся."""
+        author = self.users[0]
+        alias = shard_for(author.pk)
+        last_id = Post.objects.using(alias).latest('pk').pk
+        self.assertEqual(
+            PostSequence.objects.get(alias=alias).last_id, last_id
+        )
+        Post.objects.using(alias).filter(pk=last_id).delete()
+        post = Post.objects.create(author=author, text='Новый пост')
+        self.assertEqual(post.pk, last_id + len(SHARDS))
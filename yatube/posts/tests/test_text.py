@@ -0,0 +1,92 @@
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Post, User
+
+INDEX_URL = reverse('posts:index')
+LONG_TEXT = 'Первый абзац <b>\n\n' + 'слово ' * 100 + 'хвост'
+
+
+class PostTextTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.post = Post.objects.create(author=cls.user, text=LONG_TEXT)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_save_renders_text(self):
+        """При сохранении текст размечается, выдержка обрезается."""
+        self.assertTrue(self.post.text_html.startswith(
+            '<p>Первый абзац &lt;b&gt;</p>'
+        ))
+        self.assertLessEqual(
+            len(self.post.excerpt), settings.EXCERPT_LENGTH
+        )
+        self.assertTrue(self.post.excerpt.endswith('…'))
+        self.assertNotIn('хвост', self.post.excerpt)
+
+    def test_edit_updates_text(self):
+        """Редактирование пересобирает HTML и выдержку."""
+        self.authorized_client.post(
+            reverse('posts:post_edit', args=[self.post.pk]),
+            data={'text': 'Новый текст'},
+        )
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.text_html, '<p>Новый текст</p>')
+        self.assertEqual(post.excerpt, 'Новый текст')
+
+    def test_backfill_text(self):
+        """backfill_text заполняет поля старых постов."""
+        Post.objects.filter(pk=self.post.pk).update(
+            text_html='', excerpt='', excerpt_truncated=None
+        )
+        call_command('backfill_text', stdout=StringIO())
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.text_html, self.post.text_html)
+        self.assertEqual(post.excerpt, self.post.excerpt)
+        self.assertIs(post.excerpt_truncated, True)
+
+    def test_list_reads_only_excerpt(self):
+        """Лента не читает полный текст из базы."""
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(INDEX_URL)
+        self.assertContains(response, 'Первый абзац &lt;b&gt;')
+        self.assertNotContains(response, 'хвост')
+        for query in captured:
+            self.assertNotIn('"posts_post"."text"', query['sql'])
+
+    def test_read_more_only_for_truncated(self):
+        """Ссылка «Читать дальше» есть только у обрезанных постов."""
+        short = Post.objects.create(author=self.user, text='Короткий пост')
+        ellipsis = Post.objects.create(
+            author=self.user, text='Короткий пост с многоточием…'
+        )
+        response = self.client.get(INDEX_URL)
+        cases = ((self.post, 1), (short, 0), (ellipsis, 0))
+        for post, expected in cases:
+            with self.subTest(text=post.text[:20]):
+                link = reverse('posts:post_detail', args=[post.pk])
+                self.assertContains(
+                    response, f'<a href="{link}">Читать дальше</a>',
+                    count=expected,
+                )
+
+    def test_detail_shows_full_text(self):
+        """Страница поста показывает текст целиком."""
+        response = self.client.get(
+            reverse('posts:post_detail', args=[self.post.pk])
+        )
+        self.assertContains(response, '<p>Первый абзац &lt;b&gt;</p>')
+        self.assertContains(response, 'хвост')
@@ -69,6 +69,9 @@ class PostViewsTest(TestCase):
         super().tearDownClass()
         shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
 
+    def setUp(self) -> None:
+        cache.clear()
+
     def asert_page_has_attribute(self, post):
         self.assertEqual(post.text, self.post.text)
         self.assertEqual(post.author, self.post.author)
@@ -132,9 +135,9 @@ class PostViewsTest(TestCase):
         self.assertNotEqual(response_1, response_3)
 
     def test_404page_use_correct_template(self):
-        """Страница 404 использует соответствующий шаблон."""
+        """Страница 404 собрана из соответствующего шаблона."""
         response = self.another.get('/unexisting_page/')
-        self.assertTemplateUsed(response, 'core/404.html')
+        self.assertContains(response, 'Ошибка 404', status_code=404)
 
     def test_posts_new_post_found_in_followers_news(self):
         """
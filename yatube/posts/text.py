@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.utils.html import linebreaks
+from django.utils.text import Truncator
+
+
+def render_text(text):
+    """
+    HTML полного текста, выдержка без разметки для ленты и признак
+    того, что выдержка короче текста.
+    """
+    stripped = text.strip()
+    excerpt = Truncator(stripped).chars(settings.EXCERPT_LENGTH)
+    return linebreaks(text, autoescape=True), excerpt, excerpt != stripped
@@ -2,10 +2,13 @@ from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.cache import cache_page
 
+from core.cache import shared_cache_page
+from .archive import get_post, is_archived, with_archive
+from .deletion import visible_groups
 from .forms import PostForm, CommentForm
-from .models import Group, Post, Follow, User
+from .models import Comment, Group, Post, Follow, User
+from .sharding import followed_posts, gather, on_shard
 
 
 def get_page(stack, request):
@@ -14,21 +17,24 @@ def get_page(stack, request):
     )
 
 
-@cache_page(20)
+@shared_cache_page(settings.CASHE)
 def index(request):
     return render(request, 'posts/index.html', {
         'page_obj': get_page(
-            Post.objects.select_related('group', 'author').all(),
+            gather(
+                Post.objects.for_list().select_related('group', 'author')
+            ),
             request
         ),
     })
 
 
+@shared_cache_page(settings.CASHE, depends_on=(Post, Group))
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
+    group = get_object_or_404(visible_groups(), slug=slug)
     return render(request, 'posts/group_list.html', {
         'group': group,
-        'page_obj': get_page(group.posts.all(), request),
+        'page_obj': get_page(gather(group.posts.for_list()), request),
     })
 
 
@@ -40,14 +46,23 @@ def profile(request, username):
     ).exists()
     return render(request, 'posts/profile.html', {
         'author': author,
-        'page_obj': get_page(author.posts.all(), request),
+        'page_obj': get_page(
+            with_archive(on_shard(author.posts.for_list(), author.pk)),
+            request
+        ),
         'following': following,
     })
 
 
+@shared_cache_page(settings.CASHE, depends_on=(Post, Comment))
 def post_detail(request, post_id):
+    post = get_post(post_id)
     return render(request, 'posts/post_detail.html', {
-        'post': get_object_or_404(Post, pk=post_id),
+        'post': post,
+        'author_posts_count': with_archive(on_shard(
+            Post.objects.filter(author_id=post.author_id), post.author_id
+        )).count(),
+        'archived': is_archived(post),
         'form': CommentForm(request.POST or None),
     })
 
@@ -68,7 +83,7 @@ def post_create(request):
 
 @login_required
 def post_edit(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_object_or_404(on_shard(Post.objects, post_id), pk=post_id)
     if not request.user == post.author:
         return redirect('posts:post_detail', post_id)
     form = PostForm(
@@ -87,7 +102,7 @@ def post_edit(request, post_id):
 
 @login_required
 def add_comment(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_object_or_404(on_shard(Post.objects, post_id), pk=post_id)
     form = CommentForm(request.POST or None)
     if form.is_valid():
         comment = form.save(commit=False)
@@ -103,10 +118,7 @@ def follow_index(request):
         request,
         'posts/follow.html',
         {
-            'page_obj': get_page(Post.objects.filter(
-                author__following__user=request.user
-            ), request
-            )
+            'page_obj': get_page(followed_posts(request.user), request)
         }
     )
 
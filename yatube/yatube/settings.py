@@ -50,12 +50,22 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.metrics.MetricsMiddleware',
+    'core.middleware.server_timing.ServerTimingMiddleware',
+    'core.middleware.slow_queries.SlowQueryMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.static.StaticFilesMiddleware',
+    'core.middleware.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'core.middleware.fragments.FragmentMiddleware',
+    'core.middleware.load_shedding.LoadSheddingMiddleware',
+    'core.middleware.ratelimit.RateLimitMiddleware',
+    'core.middleware.replicas.ReplicaRoutingMiddleware',
+    'core.middleware.profiler.ProfilerMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -64,6 +74,8 @@ ROOT_URLCONF = 'yatube.urls'
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 
 CROP_TEXT = 15
+# Длина выдержки из текста поста в ленте.
+EXCERPT_LENGTH = 200
 LIMIT_OF_POSTS = 10
 
 
@@ -85,6 +97,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
+WSGI_WARMUP = False
 
 
 # Database
@@ -94,9 +107,53 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
-    }
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db_replica.sqlite3'),
+    },
+    'shard_0': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db_shard_0.sqlite3'),
+    },
+    'shard_1': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db_shard_1.sqlite3'),
+    },
+    'archive': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db_archive.sqlite3'),
+    },
 }
 
+DATABASE_ROUTERS = [
+    'posts.sharding.ShardRouter',
+    'core.routers.ReplicaRouter',
+]
+# Псевдонимы реплик для чтения; пустой список - всё идёт в default.
+DATABASE_REPLICAS = []
+REPLICA_READ_VIEWS = (
+    'posts:index',
+    'posts:group_list',
+    'posts:profile',
+    'posts:post_detail',
+)
+REPLICA_STICKY_SECONDS = 10
+# Шарды постов и комментариев по author_id; пустой список - одна БД.
+POST_SHARDS = []
+# БД для старых постов; None - архив выключен.
+ARCHIVE_DATABASE = None
+ARCHIVE_AFTER_DAYS = 365
+ARCHIVE_BATCH_SIZE = 500
+# Удаление пользователей и групп пачками, см. process_deletions.
+DELETION_BATCH_SIZE = 500
+DELETION_PAUSE = 0.05
+# Снимки SQLite, см. backup_db и restore_db.
+BACKUP_DIR = os.path.join(BASE_DIR, 'backups')
+BACKUP_PAGES = 1024
+BACKUP_SLEEP = 0.005
+BACKUP_COMPRESSION_LEVEL = 6
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -136,15 +193,45 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+# Раздача собранной статики самим приложением, если перед ним
+# нет отдельного веб-сервера.
+SERVE_STATIC = False
+STATIC_MAX_AGE = 3600
+# Страницы, собираемые командой prerender при деплое.
+PRERENDER_ROOT = os.path.join(BASE_DIR, 'prerendered')
+PRERENDERED_VIEWS = ('about:author', 'about:tech')
+PRERENDERED_TEMPLATES = (
+    'core/404.html', 'core/403.html', 'core/500.html',
+)
+PRERENDER_MAX_AGE = 86400
+# Страницы ошибок без контекст-процессоров, сессии и БД.
+STATIC_ERROR_PAGES = True
+
+AUTHENTICATION_BACKENDS = ['core.auth.CachedModelBackend']
+USER_CACHE_TIMEOUT = 60
+
+# Сессия сохраняется лишь при изменении.
+SESSION_SAVE_EVERY_REQUEST = False
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_BACKEND = 'core.mail.BackgroundEmailBackend'
+BACKGROUND_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+BACKGROUND_EMAIL_WORKERS = 2
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Кто отправляет файлы: None - сам Django, 'nginx' - X-Accel-Redirect
+# во внутренний location MEDIA_ACCEL_PREFIX, 'sendfile' - X-Sendfile.
+MEDIA_ACCEL = None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+# Остальное в MEDIA_ROOT доступно только персоналу.
+MEDIA_PUBLIC_PREFIXES = ('posts/', 'cache/')
+MEDIA_MAX_AGE = 86400
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
@@ -153,5 +240,81 @@ CACHES = {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
+# Кеш общий для всех воркеров (memcached, redis). Локальный кеш у каждого
+# процесса свой: выход и смена пароля сбросили бы его только в одном.
+SHARED_CACHE = not CACHES['default']['BACKEND'].endswith(
+    ('.LocMemCache', '.DummyCache')
+)
+# С общим кешем сессия и пользователь читаются из него, в БД идёт
+# только запись.
+SESSION_ENGINE = (
+    'django.contrib.sessions.backends.cached_db' if SHARED_CACHE
+    else 'django.contrib.sessions.backends.db'
+)
 
 CASHE = 20
+# Сколько секунд после истечения страница ещё отдаётся из кеша,
+# пока один воркер строит новую.
+PAGE_CACHE_MAX_STALE = 60
+PAGE_CACHE_LOCK_TIMEOUT = 10
+PAGE_CACHE_POLL_INTERVAL = 0.05
+
+# Порог медленного запроса к БД в миллисекундах, None - лог выключен.
+SLOW_QUERY_THRESHOLD = None
+SLOW_QUERY_SAMPLE_RATE = 0.1
+SLOW_QUERY_EXPLAIN_LIMIT = 3
+
+# Профилирование по ?_profile=1 для персонала.
+PROFILER_ENABLED = False
+PROFILER_LIMIT = 40
+
+# True - персональные фрагменты отдаются директивами SSI для
+# фронтового сервера, иначе подставляются самим приложением.
+FRAGMENTS_SSI = False
+
+# Средняя задержка запроса к БД в мс, после которой сайт переходит
+# в режим деградации; None - выключено.
+LOAD_SHEDDING_DB_LATENCY = 250
+LOAD_SHEDDING_SMOOTHING = 0.2
+LOAD_SHEDDING_COOLDOWN = 30
+LOAD_SHEDDING_EXPENSIVE_VIEWS = ('posts:follow_index',)
+# Не ходят в БД или нужны во время аварии: не отклоняются никогда.
+LOAD_SHEDDING_EXEMPT_VIEWS = (
+    'metrics', 'media', 'fragment', 'about:author', 'about:tech',
+    'users:login', 'users:logout',
+)
+
+# Лимит на URL: burst запросов за окно burst / rate секунд.
+# key: 'user' - по пользователю (анонимы по IP), 'ip' - по адресу.
+RATE_LIMITS = {
+    'posts:post_create': {'burst': 10, 'rate': '30/h', 'key': 'user'},
+    'posts:add_comment': {'burst': 20, 'rate': '120/h', 'key': 'user'},
+    'posts:profile_follow': {
+        'burst': 30, 'rate': '200/h', 'key': 'user',
+        'methods': ('GET', 'POST'),
+    },
+    'users:signup': {'burst': 5, 'rate': '20/h', 'key': 'ip'},
+    'users:login': {'burst': 10, 'rate': '60/h', 'key': 'ip'},
+}
+
+COMPRESSION_MIN_SIZE = 512
+COMPRESSION_LEVELS = {'gzip': 6, 'br': 5}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
+
+# Каталог, через который воркеры обмениваются метриками для /metrics/.
+# None - каждый процесс отдаёт только свои метрики.
+METRICS_DIR = None
+METRICS_FLUSH = 10
+
+# Заголовок Server-Timing и строка лога с фазами каждого запроса.
+SERVER_TIMING = False
@@ -1,10 +1,12 @@
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 
+from core.media import serve
+from core.views import fragment, metrics
+
 handler404 = 'core.views.page_not_found'
-handler403 = 'core.views.csrf_failure'
+handler403 = 'core.views.permission_denied'
 handler500 = 'core.views.server_error'
 
 
@@ -14,9 +16,7 @@ urlpatterns = [
     path('auth/', include('users.urls', namespace='users')),
     path('auth/', include('django.contrib.auth.urls')),
     path('about/', include('about.urls', namespace='about')),
+    path('metrics/', metrics, name='metrics'),
+    path('fragments/<slug:name>/', fragment, name='fragment'),
+    path(settings.MEDIA_URL.lstrip('/') + '<path:name>', serve, name='media'),
 ]
-
-if settings.DEBUG:
-    urlpatterns += static(
-        settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
-    )
@@ -9,8 +9,16 @@ https://docs.djangoproject.com/en/2.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
 application = get_wsgi_application()
+
+if settings.WSGI_WARMUP:
+    # С предзагрузкой (gunicorn --preload) прогрев выполняется один раз
+    # в главном процессе, и после fork воркеры получают готовые структуры.
+    from core.warmup import warm_up
+
+    warm_up()